@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import re
 from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -33,7 +34,62 @@ REASONING_INSTRUCTION = (
 )
 
 
-@dataclass
+# Keywords that suggest need for current information or explicit search requests,
+# matched as substrings of the lower-cased prompt
+_SEARCH_KEYWORDS = (
+    # Time-sensitive queries
+    "новост",
+    "сегодня",
+    "сейчас",
+    "текущ",
+    "последн",
+    "актуальн",
+    "погода",
+    "курс",
+    "цена",
+    "стоимость",
+    "событи",
+    "происход",
+    "news",
+    "today",
+    "current",
+    "latest",
+    "weather",
+    "price",
+    "когда",
+    "where",
+    "где",
+    "what happened",
+    "что случилось",
+    # Explicit search requests
+    # Using more specific phrases to reduce false positives
+    "поиск",
+    "поищи",
+    "найди",
+    "найти",
+    "искать",
+    "погугли",
+    "узнай",
+    "посмотри в интернете",
+    "посмотри в сети",
+    "проверь онлайн",
+    "интернет",
+    "в сети",
+    "онлайн",
+    "search",
+    "find information",
+    "find info",
+    "find articles",
+    "look up",
+    "google",
+    "check online",
+    "search online",
+    "internet",
+)
+_SEARCH_KEYWORDS_RE = re.compile("|".join(map(re.escape, _SEARCH_KEYWORDS)))
+
+
+@dataclass(frozen=True, slots=True)
 class GenerateResponse:
     """Response from model generation with metadata."""
 
@@ -492,58 +548,4 @@ class MistralClient:
         requests are not missed and to maintain broad coverage of query
         variations.
         """
-        prompt_lower = prompt.lower()
-
-        # Keywords that suggest need for current information or explicit search requests
-        search_keywords = [
-            # Time-sensitive queries
-            "новост",
-            "сегодня",
-            "сейчас",
-            "текущ",
-            "последн",
-            "актуальн",
-            "погода",
-            "курс",
-            "цена",
-            "стоимость",
-            "событи",
-            "происход",
-            "news",
-            "today",
-            "current",
-            "latest",
-            "weather",
-            "price",
-            "когда",
-            "where",
-            "где",
-            "what happened",
-            "что случилось",
-            # Explicit search requests
-            # Using more specific phrases to reduce false positives
-            "поиск",
-            "поищи",
-            "найди",
-            "найти",
-            "искать",
-            "погугли",
-            "узнай",
-            "посмотри в интернете",
-            "посмотри в сети",
-            "проверь онлайн",
-            "интернет",
-            "в сети",
-            "онлайн",
-            "search",
-            "find information",
-            "find info",
-            "find articles",
-            "look up",
-            "google",
-            "check online",
-            "search online",
-            "internet",
-        ]
-
-        return any(keyword in prompt_lower for keyword in search_keywords)
+        return _SEARCH_KEYWORDS_RE.search(prompt.lower()) is not None
@@ -14,6 +14,75 @@ logger = logging.getLogger(__name__)
 TOKEN_ESTIMATION_MULTIPLIER = 1.3
 
 
+# Substrings (matched against the lower-cased prompt) that signal a need for the current date
+_DATE_KEYWORDS = (
+    # Current/Today (Russian & English)
+    "сегодня",
+    "завтра",
+    "сейчас",
+    "текущ",
+    "today",
+    "now",
+    "current",
+    # News and events
+    "новост",
+    "событи",
+    "происход",
+    "случи",
+    "news",
+    "event",
+    "happened",
+    # Weather
+    "погод",
+    "температур",
+    "дождь",
+    "снег",
+    "weather",
+    "temperature",
+    "rain",
+    "snow",
+    # Prices and markets
+    "цена",
+    "курс",
+    "акци",
+    "котировк",
+    "биржа",
+    "price",
+    "exchange",
+    "stock",
+    "rate",
+    # Schedule/Time
+    "расписани",
+    "график",
+    "когда",
+    "schedule",
+    "when",
+    # Latest/Recent
+    "последн",
+    "свеж",
+    "актуальн",
+    "latest",
+    "recent",
+    # This year/month/time period
+    "этом году",
+    "этого года",
+    "в этом",
+    "за этот",
+    "this year",
+    "this month",
+    "выпущен",
+    "вышедш",
+    "вышли",
+    "released",
+    "came out",
+    "недавно",
+    "recently",
+    "fresh",
+)
+# One alternation scans the prompt once instead of running a substring test per keyword
+_DATE_KEYWORDS_RE = re.compile("|".join(map(re.escape, _DATE_KEYWORDS)))
+
+
 def requires_current_date(prompt: str) -> bool:
     """
     Determine if current date context is needed for this request.
@@ -31,74 +100,7 @@ def requires_current_date(prompt: str) -> bool:
     Returns:
         True if current date context should be provided
     """
-    prompt_lower = prompt.lower()
-
-    date_keywords = [
-        # Current/Today (Russian & English)
-        "сегодня",
-        "завтра",
-        "сейчас",
-        "текущ",
-        "today",
-        "now",
-        "current",
-        # News and events
-        "новост",
-        "событи",
-        "происход",
-        "случи",
-        "news",
-        "event",
-        "happened",
-        # Weather
-        "погод",
-        "температур",
-        "дождь",
-        "снег",
-        "weather",
-        "temperature",
-        "rain",
-        "snow",
-        # Prices and markets
-        "цена",
-        "курс",
-        "акци",
-        "котировк",
-        "биржа",
-        "price",
-        "exchange",
-        "stock",
-        "rate",
-        # Schedule/Time
-        "расписани",
-        "график",
-        "когда",
-        "schedule",
-        "when",
-        # Latest/Recent
-        "последн",
-        "свеж",
-        "актуальн",
-        "latest",
-        "recent",
-        # This year/month/time period
-        "этом году",
-        "этого года",
-        "в этом",
-        "за этот",
-        "this year",
-        "this month",
-        "выпущен",
-        "вышедш",
-        "вышли",
-        "released",
-        "came out",
-        "недавно",
-        "recently",
-        "fresh",
-    ]
-
-    return any(keyword in prompt_lower for keyword in date_keywords)
+    return _DATE_KEYWORDS_RE.search(prompt.lower()) is not None
 
 
 @dataclass
@@ -158,6 +160,89 @@ AVAILABLE_MODELS = {
 }
 
 
+# Patterns matched against the raw prompt that almost certainly mean code
+_STRONG_CODE_PATTERNS = (
+    r"```",  # Code blocks
+    r"\bdef\s+\w+\(",  # Python function definition
+    r"\bfunction\s+\w+\(",  # JS function definition
+    r"\bclass\s+\w+\s*[{:]",  # Class definition
+    r"[{}\[\]];.*[{}\[\]]",  # Multiple code syntax elements
+)
+
+# Code-related keyword patterns (matched against the lower-cased prompt)
+_CODE_KEYWORD_PATTERNS = (
+    # English - specific programming terms
+    r"\bwrite.*code\b",
+    r"\bwrite.*function\b",
+    r"\bwrite.*class\b",
+    r"\bfix.*code\b",
+    r"\bfix.*bug\b",
+    r"\bdebug\b",
+    r"\brefactor\b",
+    r"\bprogramming\b",
+    r"\bcompile\b",
+    r"\bsyntax error\b",
+    # Programming language names
+    r"\bpython\b",
+    r"\bjavascript\b",
+    r"\btypescript\b",
+    r"\bjava\b(?!script)",
+    r"(?<!\w)c\+\+(?!\w)",
+    r"(?<!\w)c#(?!\w)",
+    r"\brust\b.*\b(lang|code|program)",
+    r"\bgo\b.*\b(lang|code|program)",
+    # Russian
+    r"\bнапиши.*код\b",
+    r"\bнапиши.*функци\b",
+    r"\bисправ.*код\b",
+    r"\bисправ.*ошибк.*программ\b",
+    r"\bотладк\b",
+    r"\bкомпил\b",
+)
+
+# Substrings (matched against the lower-cased prompt) that indicate complex reasoning needs
+_COMPLEXITY_INDICATORS = (
+    # Multi-step reasoning
+    "step by step",
+    "explain why",
+    "analyze",
+    "compare",
+    "evaluate",
+    "reasoning",
+    "логика",
+    "анализ",
+    "сравни",
+    "оцени",
+    "рассужд",
+    "почему",
+    # Long-form content
+    "write an essay",
+    "detailed explanation",
+    "comprehensive",
+    "in-depth",
+    "напиши статью",
+    "подробн",
+    "детальн",
+    "всесторон",
+    # Complex tasks
+    "plan",
+    "strategy",
+    "design",
+    "architecture",
+    "solution",
+    "план",
+    "стратеги",
+    "дизайн",
+    "архитектур",
+    "решение",
+)
+
+# Each set is folded into one alternation, compiled once at import time
+_STRONG_CODE_RE = re.compile("|".join(f"(?:{p})" for p in _STRONG_CODE_PATTERNS))
+_CODE_KEYWORDS_RE = re.compile("|".join(f"(?:{p})" for p in _CODE_KEYWORD_PATTERNS))
+_COMPLEXITY_INDICATORS_RE = re.compile("|".join(map(re.escape, _COMPLEXITY_INDICATORS)))
+
+
 class ModelSelector:
     """Analyzes requests and selects the most appropriate Mistral model."""
 
@@ -232,57 +317,11 @@ class ModelSelector:
         Returns:
             True if request appears to be code-related
         """
-        prompt_lower = prompt.lower()
-
-        # First, check for strong code patterns (code blocks, syntax)
-        strong_code_patterns = [
-            r"```",  # Code blocks
-            r"\bdef\s+\w+\(",  # Python function definition
-            r"\bfunction\s+\w+\(",  # JS function definition
-            r"\bclass\s+\w+\s*[{:]",  # Class definition
-            r"[{}\[\]];.*[{}\[\]]",  # Multiple code syntax elements
-        ]
-
-        for pattern in strong_code_patterns:
-            if re.search(pattern, prompt):
-                return True
-
-        # Code-related keywords in multiple languages (more specific)
-        code_keywords = [
-            # English - specific programming terms
-            r"\bwrite.*code\b",
-            r"\bwrite.*function\b",
-            r"\bwrite.*class\b",
-            r"\bfix.*code\b",
-            r"\bfix.*bug\b",
-            r"\bdebug\b",
-            r"\brefactor\b",
-            r"\bprogramming\b",
-            r"\bcompile\b",
-            r"\bsyntax error\b",
-            # Programming language names
-            r"\bpython\b",
-            r"\bjavascript\b",
-            r"\btypescript\b",
-            r"\bjava\b(?!script)",
-            r"(?<!\w)c\+\+(?!\w)",
-            r"(?<!\w)c#(?!\w)",
-            r"\brust\b.*\b(lang|code|program)",
-            r"\bgo\b.*\b(lang|code|program)",
-            # Russian
-            r"\bнапиши.*код\b",
-            r"\bнапиши.*функци\b",
-            r"\bисправ.*код\b",
-            r"\bисправ.*ошибк.*программ\b",
-            r"\bотладк\b",
-            r"\bкомпил\b",
-        ]
-
-        for keyword_pattern in code_keywords:
-            if re.search(keyword_pattern, prompt_lower):
-                return True
-
-        return False
+        # Strong code patterns (code blocks, syntax) are matched case-sensitively,
+        # code-related keywords against the lower-cased prompt
+        if _STRONG_CODE_RE.search(prompt):
+            return True
+        return _CODE_KEYWORDS_RE.search(prompt.lower()) is not None
 
     def _is_complex_request(self, prompt: str) -> bool:
         """
@@ -294,47 +333,8 @@ class ModelSelector:
         Returns:
             True if request appears to require complex reasoning
         """
-        prompt_lower = prompt.lower()
-
-        # Indicators of complex reasoning needs
-        complexity_indicators = [
-            # Multi-step reasoning
-            "step by step",
-            "explain why",
-            "analyze",
-            "compare",
-            "evaluate",
-            "reasoning",
-            "логика",
-            "анализ",
-            "сравни",
-            "оцени",
-            "рассужд",
-            "почему",
-            # Long-form content
-            "write an essay",
-            "detailed explanation",
-            "comprehensive",
-            "in-depth",
-            "напиши статью",
-            "подробн",
-            "детальн",
-            "всесторон",
-            # Complex tasks
-            "plan",
-            "strategy",
-            "design",
-            "architecture",
-            "solution",
-            "план",
-            "стратеги",
-            "дизайн",
-            "архитектур",
-            "решение",
-        ]
-
         # Check for complexity indicators
-        if any(indicator in prompt_lower for indicator in complexity_indicators):
+        if _COMPLEXITY_INDICATORS_RE.search(prompt.lower()):
             return True
 
         # Check prompt length as indicator of complexity
@@ -6,10 +6,11 @@ import asyncio
 import base64
 import logging
 import time
+from collections.abc import Awaitable, Callable
 
 from telegram import Message, Update
 from telegram.constants import ChatAction
-from telegram.error import BadRequest, RetryAfter
+from telegram.error import BadRequest, RetryAfter, TimedOut
 from telegram.ext import ContextTypes
 
 from src.api.mistral_client import MistralClient
@@ -30,6 +31,196 @@ MSG_SEARCH_UNAVAILABLE = "⚠️ _Поиск временно недоступе
 # Label for the sources block appended to search responses
 MSG_SOURCES_HEADER = "Источники"
 
+# Client-side throttle for outgoing Telegram calls.  Telegram allows about 30
+# messages per second per bot.  The rate sits below that cap on purpose: a full
+# burst plus one second of refill is 10 + 20 = 30 calls, so even the first
+# second stays within the limit, while a 25-30/s rate would overshoot it by the
+# burst.  The headroom also covers calls that bypass the bucket (typing actions,
+# reactions), so RetryAfter remains a fallback rather than the steady-state path.
+TELEGRAM_SEND_RATE = 20.0  # tokens refilled per second
+TELEGRAM_SEND_BURST = 10  # calls allowed back-to-back before throttling
+
+
+class _TokenBucket:
+    """Token bucket that spaces out calls to at most ``rate`` per second after a burst.
+
+    Callers reserve a token synchronously and then sleep for their share of the
+    backlog, so concurrent senders queue up fairly without an ``asyncio.Lock``
+    (which would tie the module-level bucket to a single event loop).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity, i.e. calls allowed without waiting
+            clock: Monotonic time source (default: time.monotonic)
+        """
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    def reset(self) -> None:
+        """Refill the bucket, as if no calls had been made."""
+        self._tokens = float(self._burst)
+        self._updated = self._clock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds to wait before using it."""
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self._burst, self._tokens + elapsed * self._rate) - 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self._rate
+
+    async def acquire(
+        self, sleep_fn: Callable[[float], Awaitable[object]] = asyncio.sleep
+    ) -> None:
+        """Wait until a token is available."""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            await sleep_fn(wait_time)
+
+
+# Circuit breaker for outgoing Telegram calls: after this many consecutive
+# rate-limit/timeout failures in a chat, sends and edits to that chat fail fast
+# until the recovery window passes.
+TELEGRAM_BREAKER_THRESHOLD = 5
+TELEGRAM_BREAKER_RECOVERY = 30.0  # seconds
+
+
+class _CircuitBreaker:
+    """Fail fast while Telegram keeps rate limiting or timing out.
+
+    After ``error_threshold`` consecutive failures the circuit opens and calls
+    are rejected without touching the API.  Once ``recovery_window`` seconds
+    have passed it goes half-open and lets a single probe through: success
+    closes the circuit, another failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        error_threshold: int,
+        recovery_window: float,
+        clock: Callable[[], float] = time.monotonic,
+        on_close: Callable[[], object] | None = None,
+    ) -> None:
+        """Initialize a closed circuit.
+
+        Args:
+            error_threshold: Consecutive failures that open the circuit
+            recovery_window: Seconds to stay open before probing again
+            clock: Monotonic time source (default: time.monotonic)
+            on_close: Called after every success, once the circuit is closed
+        """
+        self._error_threshold = error_threshold
+        self._recovery_window = recovery_window
+        self._clock = clock
+        self._on_close = on_close
+        self._failures = 0
+        self._opened_at = 0.0
+        self.state = self.CLOSED
+
+    def allow(self) -> bool:
+        """Return True if a call may go through now."""
+        if self.state == self.CLOSED:
+            return True
+        now = self._clock()
+        if now - self._opened_at < self._recovery_window:
+            return False
+        # Let one probe through; if it never reports back, another follows
+        # after the next window
+        self.state = self.HALF_OPEN
+        self._opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after Telegram answered a call."""
+        self._failures = 0
+        self.state = self.CLOSED
+        if self._on_close is not None:
+            self._on_close()
+
+    def record_failure(self) -> None:
+        """Count a rate-limit or timeout failure, opening the circuit when needed."""
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self._error_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"Telegram circuit opened after {self._failures} consecutive failures, "
+                    f"failing fast for {self._recovery_window}s"
+                )
+            self.state = self.OPEN
+            self._opened_at = self._clock()
+
+
+class _ChatCircuitBreakers:
+    """One ``_CircuitBreaker`` per chat, created on first use.
+
+    RetryAfter on sends and edits is mostly Telegram's per-chat limit, so a
+    flood of edits in one chat must not make every other chat fail fast.  A
+    chat's breaker is dropped as soon as it closes, so only chats that are
+    currently failing are kept.
+    """
+
+    def __init__(
+        self,
+        error_threshold: int,
+        recovery_window: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize without any breakers.
+
+        Args:
+            error_threshold: Consecutive failures that open a chat's circuit
+            recovery_window: Seconds a chat's circuit stays open before probing again
+            clock: Monotonic time source (default: time.monotonic)
+        """
+        self._error_threshold = error_threshold
+        self._recovery_window = recovery_window
+        self._clock = clock
+        self._breakers: dict[int, _CircuitBreaker] = {}
+
+    def for_chat(self, chat_id: int) -> _CircuitBreaker:
+        """Return the breaker for *chat_id*, creating a closed one if needed."""
+        breaker = self._breakers.get(chat_id)
+        if breaker is None:
+            breaker = _CircuitBreaker(
+                self._error_threshold,
+                self._recovery_window,
+                self._clock,
+                on_close=lambda: self._forget(chat_id, breaker),
+            )
+            self._breakers[chat_id] = breaker
+        return breaker
+
+    def _forget(self, chat_id: int, breaker: _CircuitBreaker) -> None:
+        """Drop *breaker* for *chat_id* unless a newer one has replaced it."""
+        if self._breakers.get(chat_id) is breaker:
+            del self._breakers[chat_id]
+
+    def clear(self) -> None:
+        """Forget every chat's breaker, closing all circuits."""
+        self._breakers.clear()
+
+
+_telegram_limiter = _TokenBucket(TELEGRAM_SEND_RATE, TELEGRAM_SEND_BURST)
+_telegram_breakers = _ChatCircuitBreakers(TELEGRAM_BREAKER_THRESHOLD, TELEGRAM_BREAKER_RECOVERY)
+
 
 def _format_source_urls(urls: list[str]) -> str:
     """Format source URLs as a block to append to the response.
@@ -105,7 +296,10 @@ async def _safe_edit_message(
     text: str,
     parse_mode: str | None = "Markdown",
     max_retries: int = 3,
-    allow_parse_retry: bool = True
+    allow_parse_retry: bool = True,
+    sleep_fn: Callable[[float], Awaitable[object]] = asyncio.sleep,
+    limiter: _TokenBucket | None = _telegram_limiter,
+    breakers: _ChatCircuitBreakers | None = _telegram_breakers,
 ) -> bool:
     """Safely edit a message with retry logic for rate limiting.
 
@@ -115,15 +309,41 @@ async def _safe_edit_message(
         parse_mode: Parse mode for formatting (default: "Markdown")
         max_retries: Maximum total attempts (default: 3, including initial attempt)
         allow_parse_retry: Allow retry with parse_mode=None on parse errors
+        sleep_fn: Coroutine function used to wait out rate limits (default: asyncio.sleep)
+        limiter: Token bucket awaited before every attempt; None disables throttling
+        breakers: Per-chat circuit breakers that reject attempts while Telegram keeps
+            failing for the message's chat; None disables them.  A call counts as
+            at most one failure, however many attempts it makes
 
     Returns:
         True if edit was successful, False otherwise
     """
+    breaker = breakers.for_chat(message.chat_id) if breakers is not None else None
+    failure_recorded = False
     for attempt in range(max_retries):
+        if breaker is not None and not breaker.allow():
+            logger.warning(
+                f"Telegram circuit is open for chat {message.chat_id}, dropping message edit"
+            )
+            return False
+        if limiter is not None:
+            await limiter.acquire(sleep_fn)
         try:
             await message.edit_text(text, parse_mode=parse_mode)
+            if breaker is not None:
+                breaker.record_success()
             return True
         except RetryAfter as e:
+            if breaker is not None and not failure_recorded:
+                failure_recorded = True
+                breaker.record_failure()
+                if breaker.state == _CircuitBreaker.OPEN:
+                    # Fail fast instead of sleeping only to be rejected next attempt
+                    logger.warning(
+                        f"Telegram circuit opened for chat {message.chat_id}, "
+                        "dropping message edit"
+                    )
+                    return False
             if attempt < max_retries - 1:
                 # Wait for the specified time plus a small buffer
                 wait_time = e.retry_after + 0.5
@@ -131,7 +351,7 @@ async def _safe_edit_message(
                     f"Rate limit exceeded, waiting {wait_time}s before retry "
                     f"(attempt {attempt + 1}/{max_retries})"
                 )
-                await asyncio.sleep(wait_time)
+                await sleep_fn(wait_time)
             else:
                 # Max retries exceeded
                 logger.error(
@@ -140,6 +360,9 @@ async def _safe_edit_message(
                 )
                 return False
         except BadRequest as e:
+            # Telegram answered, so the API itself is reachable
+            if breaker is not None:
+                breaker.record_success()
             # Handle other BadRequest errors (not rate limiting)
             error_msg = str(e).lower()
             if "message is not modified" in error_msg:
@@ -151,11 +374,17 @@ async def _safe_edit_message(
                     logger.warning(f"Markdown parse error, retrying as plain text: {e}")
                     return await _safe_edit_message(
                         message, text, parse_mode=None,
-                        max_retries=max_retries, allow_parse_retry=False
+                        max_retries=max_retries, allow_parse_retry=False,
+                        sleep_fn=sleep_fn, limiter=limiter, breakers=breakers,
                     )
             # For other BadRequest errors, fail
             logger.warning(f"Failed to edit message: {e}")
             return False
+        except TimedOut as e:
+            if breaker is not None and not failure_recorded:
+                breaker.record_failure()
+            logger.warning(f"Timed out while editing message: {e}")
+            return False
         except Exception as e:
             # Unexpected error
             logger.error(f"Unexpected error while editing message: {e}")
@@ -169,7 +398,10 @@ async def _safe_send_message(
     text: str,
     parse_mode: str | None = "Markdown",
     max_retries: int = 3,
-    allow_parse_retry: bool = True
+    allow_parse_retry: bool = True,
+    sleep_fn: Callable[[float], Awaitable[object]] = asyncio.sleep,
+    limiter: _TokenBucket | None = _telegram_limiter,
+    breakers: _ChatCircuitBreakers | None = _telegram_breakers,
 ) -> Message | None:
     """Safely send a message with retry logic for rate limiting.
 
@@ -179,14 +411,41 @@ async def _safe_send_message(
         parse_mode: Parse mode for formatting (default: "Markdown")
         max_retries: Maximum total attempts (default: 3, including initial attempt)
         allow_parse_retry: Allow retry with parse_mode=None on parse errors
+        sleep_fn: Coroutine function used to wait out rate limits (default: asyncio.sleep)
+        limiter: Token bucket awaited before every attempt; None disables throttling
+        breakers: Per-chat circuit breakers that reject attempts while Telegram keeps
+            failing for the message's chat; None disables them.  A call counts as
+            at most one failure, however many attempts it makes
 
     Returns:
         The sent message, or None if failed
     """
+    breaker = breakers.for_chat(message.chat_id) if breakers is not None else None
+    failure_recorded = False
     for attempt in range(max_retries):
+        if breaker is not None and not breaker.allow():
+            logger.warning(
+                f"Telegram circuit is open for chat {message.chat_id}, dropping message send"
+            )
+            return None
+        if limiter is not None:
+            await limiter.acquire(sleep_fn)
         try:
-            return await message.reply_text(text, parse_mode=parse_mode)
+            sent = await message.reply_text(text, parse_mode=parse_mode)
+            if breaker is not None:
+                breaker.record_success()
+            return sent
         except RetryAfter as e:
+            if breaker is not None and not failure_recorded:
+                failure_recorded = True
+                breaker.record_failure()
+                if breaker.state == _CircuitBreaker.OPEN:
+                    # Fail fast instead of sleeping only to be rejected next attempt
+                    logger.warning(
+                        f"Telegram circuit opened for chat {message.chat_id}, "
+                        "dropping message send"
+                    )
+                    return None
             if attempt < max_retries - 1:
                 # Wait for the specified time plus a small buffer
                 wait_time = e.retry_after + 0.5
@@ -194,7 +453,7 @@ async def _safe_send_message(
                     f"Rate limit exceeded, waiting {wait_time}s before retry "
                     f"(attempt {attempt + 1}/{max_retries})"
                 )
-                await asyncio.sleep(wait_time)
+                await sleep_fn(wait_time)
             else:
                 # Max retries exceeded
                 logger.error(
@@ -203,6 +462,9 @@ async def _safe_send_message(
                 )
                 return None
         except BadRequest as e:
+            # Telegram answered, so the API itself is reachable
+            if breaker is not None:
+                breaker.record_success()
             # Try again without parse mode if it's a parse error
             error_msg = str(e).lower()
             if "can't parse" in error_msg or "parse error" in error_msg:
@@ -210,11 +472,17 @@ async def _safe_send_message(
                     logger.warning(f"Markdown parse error, retrying as plain text: {e}")
                     return await _safe_send_message(
                         message, text, parse_mode=None,
-                        max_retries=max_retries, allow_parse_retry=False
+                        max_retries=max_retries, allow_parse_retry=False,
+                        sleep_fn=sleep_fn, limiter=limiter, breakers=breakers,
                     )
             # For other BadRequest errors, fail
             logger.warning(f"Failed to send message: {e}")
             return None
+        except TimedOut as e:
+            if breaker is not None and not failure_recorded:
+                breaker.record_failure()
+            logger.warning(f"Timed out while sending message: {e}")
+            return None
         except Exception as e:
             # Unexpected error
             logger.error(f"Unexpected error while sending message: {e}")
@@ -507,6 +775,9 @@ class MessageHandler:
             # Streaming completed successfully
             streaming_successful = True
 
+            # The final answer and error reports bypass the circuit breaker, which
+            # should only shed the intermediate edits made while streaming
+
             # After streaming completes, handle final message
             if accumulated_content:
                 # Append source URLs block if web search was used
@@ -531,7 +802,7 @@ class MessageHandler:
                     if sent_message:
                         # Update the first message with proper prefix
                         edit_success = await _safe_edit_message(
-                            sent_message, first_chunk_text, parse_mode="Markdown"
+                            sent_message, first_chunk_text, parse_mode="Markdown", breakers=None
                         )
                         if not edit_success:
                             logger.warning(
@@ -539,12 +810,12 @@ class MessageHandler:
                                 "sending new message instead"
                             )
                             sent_message = await _safe_send_message(
-                                message, first_chunk_text, parse_mode="Markdown"
+                                message, first_chunk_text, parse_mode="Markdown", breakers=None
                             )
                     else:
                         # First message was never sent (short response), send it now
                         sent_message = await _safe_send_message(
-                            message, first_chunk_text, parse_mode="Markdown"
+                            message, first_chunk_text, parse_mode="Markdown", breakers=None
                         )
 
                     # Send remaining chunks
@@ -554,7 +825,7 @@ class MessageHandler:
                             f"({MSG_MULTI_PART_PREFIX} {i}/{len(chunks)})\n\n{normalized}"
                         )
                         result = await _safe_send_message(
-                            message, chunk_text, parse_mode="Markdown"
+                            message, chunk_text, parse_mode="Markdown", breakers=None
                         )
                         if result is None:
                             logger.warning(
@@ -566,7 +837,7 @@ class MessageHandler:
                     if sent_message:
                         # Update to remove streaming indicator if present
                         success = await _safe_edit_message(
-                            sent_message, normalized, parse_mode="Markdown"
+                            sent_message, normalized, parse_mode="Markdown", breakers=None
                         )
                         if not success:
                             logger.warning(
@@ -575,7 +846,7 @@ class MessageHandler:
                     else:
                         # Short response that never triggered threshold, send now
                         sent_message = await _safe_send_message(
-                            message, normalized, parse_mode="Markdown"
+                            message, normalized, parse_mode="Markdown", breakers=None
                         )
 
                 # Store in memory only after successful completion
@@ -593,14 +864,20 @@ class MessageHandler:
             logger.exception("Failed during streaming response")
             # Send error message
             if sent_message is None:
-                error_msg_sent = await _safe_send_message(message, MSG_ERROR, parse_mode=None)
+                error_msg_sent = await _safe_send_message(
+                    message, MSG_ERROR, parse_mode=None, breakers=None
+                )
                 if error_msg_sent is None:
                     logger.error("Failed to send error message to user")
             else:
                 # Try to edit, if that fails, send a new message
-                success = await _safe_edit_message(sent_message, MSG_ERROR, parse_mode=None)
+                success = await _safe_edit_message(
+                    sent_message, MSG_ERROR, parse_mode=None, breakers=None
+                )
                 if not success:
-                    error_msg_sent = await _safe_send_message(message, MSG_ERROR, parse_mode=None)
+                    error_msg_sent = await _safe_send_message(
+                        message, MSG_ERROR, parse_mode=None, breakers=None
+                    )
                     if error_msg_sent is None:
                         logger.error("Failed to send error message to user")
 
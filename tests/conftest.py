@@ -0,0 +1,105 @@
+"""Shared pytest configuration for the test suite."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.bot.handlers import message_handler
+
+try:
+    import uvloop
+except ImportError:  # Windows, or dev dependencies installed without it
+    uvloop = None
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register ``--run-e2e`` for the tests that spawn a real bot process."""
+    parser.addoption(
+        "--run-e2e",
+        action="store_true",
+        default=False,
+        help="run end-to-end tests that start the bot in a subprocess",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip tests marked ``e2e`` unless ``--run-e2e`` is given."""
+    if config.getoption("--run-e2e"):
+        return
+    skip_e2e = pytest.mark.skip(reason="needs --run-e2e")
+    for item in items:
+        if "e2e" in item.keywords:
+            item.add_marker(skip_e2e)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Use uvloop for the test event loop when it is available."""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.fixture(autouse=True)
+def _telegram_throttle() -> None:
+    """Start every test with a full Telegram send bucket and closed circuits.
+
+    ``_safe_send_message`` and ``_safe_edit_message`` default to the module-level
+    token bucket and per-chat breakers, so without a reset one test's sends
+    would throttle or fail fast in the next.
+    """
+    message_handler._telegram_limiter.reset()
+    message_handler._telegram_breakers.clear()
+
+
+def _recording_coroutine(value: Any) -> Callable[..., Awaitable[Any]]:
+    """Return a coroutine function resolving to *value* that records its kwargs in ``.calls``."""
+    calls: list[dict[str, Any]] = []
+
+    async def _stub(**kwargs: Any) -> Any:
+        calls.append(kwargs)
+        return value
+
+    _stub.calls = calls  # type: ignore[attr-defined]
+    return _stub
+
+
+@lru_cache(maxsize=32)
+def _chat_response(content: object, prompt_tokens: int, completion_tokens: int) -> SimpleNamespace:
+    """Build a chat completion response once per shape; the clients only read it."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+@pytest.fixture(scope="session")
+def make_chat_client() -> Callable[..., SimpleNamespace]:
+    """Factory wiring a patched Mistral SDK class to a client with a canned chat reply.
+
+    Both the client and the response are plain ``SimpleNamespace`` graphs, which
+    are far cheaper to build than nested mocks; ``chat.complete_async.calls``
+    holds the kwargs of every request the code under test made.
+    """
+
+    def _make(
+        mock_sdk: MagicMock,
+        content: object = "ok",
+        prompt_tokens: int = 5,
+        completion_tokens: int = 5,
+    ) -> SimpleNamespace:
+        complete_async = _recording_coroutine(
+            _chat_response(content, prompt_tokens, completion_tokens)
+        )
+        mock_client = SimpleNamespace(chat=SimpleNamespace(complete_async=complete_async))
+        mock_sdk.return_value = mock_client
+        return mock_client
+
+    return _make
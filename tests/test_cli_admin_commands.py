@@ -28,7 +28,6 @@ def _settings(
 class TestCLIChatAdminCommands:
     """Tests for CLI admin command integration."""
 
-    @pytest.mark.asyncio
     async def test_cli_admin_reactions_on(self, tmp_path: Path) -> None:
         """CLI should be able to enable reactions."""
         s = _settings(admin_ids=[1])
@@ -41,7 +40,6 @@ class TestCLIChatAdminCommands:
         assert result is None  # Command handling returns None
         assert s.access.reactions_enabled is True
 
-    @pytest.mark.asyncio
     async def test_cli_admin_reactions_off(self, tmp_path: Path) -> None:
         """CLI should be able to disable reactions."""
         s = _settings(admin_ids=[1])
@@ -54,7 +52,6 @@ class TestCLIChatAdminCommands:
         assert result is None  # Command handling returns None
         assert s.access.reactions_enabled is False
 
-    @pytest.mark.asyncio
     async def test_cli_admin_reactions_status(self) -> None:
         """CLI should be able to check reactions status."""
         s = _settings(admin_ids=[1])
@@ -64,7 +61,6 @@ class TestCLIChatAdminCommands:
 
         assert result is None  # Command handling returns None
 
-    @pytest.mark.asyncio
     async def test_cli_admin_list(self) -> None:
         """CLI should be able to list access settings."""
         s = _settings(admin_ids=[1], allowed_users=[10, 20])
@@ -74,7 +70,6 @@ class TestCLIChatAdminCommands:
 
         assert result is None  # Command handling returns None
 
-    @pytest.mark.asyncio
     async def test_cli_auto_grants_admin_when_empty(self, tmp_path: Path) -> None:
         """CLI should automatically grant admin rights to user_id=1 when admin list is empty."""
         # Start with no admin IDs
@@ -96,7 +91,6 @@ class TestCLIChatAdminCommands:
 class TestCLIChatStatusMessages:
     """Tests for CLI status message output."""
 
-    @pytest.mark.asyncio
     async def test_cli_prints_thinking_status(self, capsys: pytest.CaptureFixture) -> None:
         """CLI should print thinking status before generating response."""
         from unittest.mock import AsyncMock, MagicMock
@@ -121,7 +115,6 @@ class TestCLIChatStatusMessages:
         captured = capsys.readouterr()
         assert s.status_messages.thinking in captured.out
 
-    @pytest.mark.asyncio
     async def test_cli_prints_search_status_for_web_queries(
         self, capsys: pytest.CaptureFixture
     ) -> None:
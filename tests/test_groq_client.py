@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -68,7 +68,6 @@ def test_client_init(mock_groq: MagicMock, settings: AppSettings) -> None:
 
 
 @patch("src.api.groq_client.AsyncGroq")
-@pytest.mark.asyncio
 async def test_generate(mock_groq: MagicMock, settings: AppSettings) -> None:
     """generate() should return GenerateResponse with Groq output."""
     mock_client = MagicMock()
@@ -88,15 +87,13 @@ async def test_generate(mock_groq: MagicMock, settings: AppSettings) -> None:
     client = GroqClient(settings)
     result = await client.generate("Hi")
 
-    assert isinstance(result, GenerateResponse)
-    assert result.content == "Hello from Groq!"
-    assert result.input_tokens == 5
-    assert result.output_tokens == 10
+    assert result == GenerateResponse(
+        content="Hello from Groq!", model=ANY, input_tokens=5, output_tokens=10
+    )
     assert result.total_tokens == 15
 
 
 @patch("src.api.groq_client.AsyncGroq")
-@pytest.mark.asyncio
 async def test_generate_no_choices(mock_groq: MagicMock, settings: AppSettings) -> None:
     """generate() should raise ValueError when API returns no choices."""
     mock_client = MagicMock()
@@ -111,7 +108,6 @@ async def test_generate_no_choices(mock_groq: MagicMock, settings: AppSettings)
 
 
 @patch("src.api.groq_client.AsyncGroq")
-@pytest.mark.asyncio
 async def test_generate_with_selected_model(
     mock_groq: MagicMock, settings: AppSettings
 ) -> None:
@@ -2,16 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import logging
+from collections.abc import Awaitable, Callable, Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from telegram.constants import ChatAction
+from telegram.error import NetworkError, TelegramError, TimedOut
 
+from src.api.mistral_client import GenerateResponse
+from src.bot.bot import _error_handler
+from src.bot.filters.access_filter import AccessFilter
 from src.bot.handlers.admin_handler import AdminHandler
 from src.bot.handlers.command_handler import CommandHandler
 from src.bot.handlers.message_handler import (
     MessageHandler,
     _send_typing_periodically,
-    _split_text,
 )
 from src.config.settings import AccessSettings, AdminSettings, AppSettings, BotSettings
 
@@ -19,46 +30,122 @@ from src.config.settings import AccessSettings, AdminSettings, AppSettings, BotS
 # Helpers
 # ------------------------------------------------------------------
 
+SettingsFactory = Callable[..., AppSettings]
+AdminHandlerFactory = Callable[..., tuple[AppSettings, AdminHandler]]
 
-def _settings(
-    admin_ids: list[int] | None = None,
-    allowed_users: list[int] | None = None,
-) -> AppSettings:
-    return AppSettings(
+# Pass-through context for tests where the handler never touches it
+_DUMMY_CTX = MagicMock()
+
+_JPEG_BYTES = b"\xff\xd8test"
+_EXPECTED_JPEG_URL = "data:image/jpeg;base64," + base64.b64encode(_JPEG_BYTES).decode()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _config_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Redirect ``save_access`` writes to one temp directory for the whole module."""
+    config_dir = tmp_path_factory.mktemp("config")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("src.config.settings.CONFIG_DIR", config_dir)
+        yield config_dir
+
+
+@pytest.fixture(scope="session")
+def _base_settings() -> AppSettings:
+    """Build the baseline ``AppSettings`` once, skipping validation and env loading."""
+    return AppSettings.model_construct(
         telegram_bot_token="fake",
         mistral_api_key="fake",
-        admin=AdminSettings(user_ids=admin_ids or []),
-        access=AccessSettings(allowed_user_ids=allowed_users or []),
-        bot=BotSettings(username="testbot"),
+        admin=AdminSettings.model_construct(user_ids=[]),
+        access=AccessSettings.model_construct(allowed_user_ids=[]),
+        bot=BotSettings.model_construct(username="testbot"),
     )
 
 
-def _update(user_id: int = 1, text: str = "hello", chat_type: str = "private") -> MagicMock:
-    update = MagicMock()
-    update.message.from_user.id = user_id
-    update.message.chat.type = chat_type
-    update.message.chat.id = user_id
-    update.message.text = text
-    update.message.photo = None
-    update.message.reply_to_message = None
-    update.message.entities = None
-    update.effective_user.id = user_id
-    update.message.reply_text = AsyncMock()
-    return update
+@pytest.fixture(scope="session")
+def make_settings(_base_settings: AppSettings) -> SettingsFactory:
+    """Return a factory producing fresh deep copies of the baseline settings."""
 
+    def _make(
+        admin_ids: list[int] | None = None,
+        allowed_users: list[int] | None = None,
+    ) -> AppSettings:
+        s = _base_settings.model_copy(deep=True)
+        s.admin.user_ids = list(admin_ids or [])
+        s.access.allowed_user_ids = list(allowed_users or [])
+        return s
 
-# ------------------------------------------------------------------
-# _split_text
-# ------------------------------------------------------------------
+    return _make
+
+
+@pytest.fixture(scope="class")
+def _shared_mistral() -> MagicMock:
+    """Build one MistralClient stub per test class for tests that only dispatch."""
+    mistral = MagicMock()
+    mistral.generate = AsyncMock(
+        return_value=GenerateResponse(content="hello", model="mistral-small-latest")
+    )
+    mistral._web_search = None
+    mistral._should_use_web_search = MagicMock(return_value=False)
+    return mistral
+
+
+@pytest.fixture
+def stub_mistral(_shared_mistral: MagicMock) -> Iterator[MagicMock]:
+    """Hand out the class-scoped stub and clear its recorded calls afterwards."""
+    yield _shared_mistral
+    _shared_mistral.reset_mock()
+
+
+async def _async_noop(*args: Any, **kwargs: Any) -> None:
+    """Cheap stand-in for awaited calls whose arguments are never inspected."""
 
 
-def test_split_text_short() -> None:
-    assert _split_text("hello", 100) == ["hello"]
+def _async_return(value: Any) -> Callable[..., Awaitable[Any]]:
+    """Return a coroutine function that always resolves to *value*."""
 
+    async def _stub(*args: Any, **kwargs: Any) -> Any:
+        return value
 
-def test_split_text_long() -> None:
-    chunks = _split_text("abcdef", 2)
-    assert chunks == ["ab", "cd", "ef"]
+    return _stub
+
+
+# Message attributes the handlers read that a plain text update leaves unset
+_EMPTY_MESSAGE_FIELDS: dict[str, None] = dict.fromkeys(
+    (
+        "caption",
+        "entities",
+        "reply_to_message",
+        "forward_origin",
+        "photo",
+        "video",
+        "audio",
+        "voice",
+        "document",
+        "sticker",
+        "animation",
+        "location",
+        "contact",
+        "invoice",
+    )
+)
+
+
+def _update(
+    user_id: int = 1,
+    text: str = "hello",
+    chat_type: str = "private",
+    reply: Any = None,
+) -> SimpleNamespace:
+    """Build a fake update whose ``reply_text`` resolves to *reply*."""
+    message = SimpleNamespace(
+        from_user=SimpleNamespace(id=user_id, username=None, first_name="Test", is_bot=False),
+        chat=SimpleNamespace(id=user_id, type=chat_type),
+        chat_id=user_id,
+        text=text,
+        reply_text=AsyncMock(return_value=reply),
+        **_EMPTY_MESSAGE_FIELDS,
+    )
+    return SimpleNamespace(message=message, effective_user=SimpleNamespace(id=user_id))
 
 
 # ------------------------------------------------------------------
@@ -67,35 +154,26 @@ def test_split_text_long() -> None:
 
 
 class TestCommandHandler:
-    @pytest.mark.asyncio
-    async def test_start_allowed(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+    async def test_start_allowed(self, make_settings: SettingsFactory) -> None:
+        s = make_settings(allowed_users=[1])
         af = AccessFilter(s)
         handler = CommandHandler(af, "testbot")
         update = _update(user_id=1)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.start(update, ctx)
         update.message.reply_text.assert_awaited_once()
 
-    @pytest.mark.asyncio
-    async def test_help_disallowed(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+    async def test_help_disallowed(self, make_settings: SettingsFactory) -> None:
+        s = make_settings(allowed_users=[1])
         af = AccessFilter(s)
         handler = CommandHandler(af, "testbot")
         update = _update(user_id=99)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.help(update, ctx)
         update.message.reply_text.assert_not_awaited()
 
-    @pytest.mark.asyncio
-    async def test_info_allowed(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+    async def test_info_allowed(self, make_settings: SettingsFactory) -> None:
+        s = make_settings(allowed_users=[1])
         af = AccessFilter(s)
         mistral = MagicMock()
         mistral.get_context_info = MagicMock(return_value={
@@ -107,7 +185,7 @@ class TestCommandHandler:
         })
         handler = CommandHandler(af, "testbot", mistral_client=mistral)
         update = _update(user_id=1)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.info(update, ctx)
         update.message.reply_text.assert_awaited_once()
         call_text = update.message.reply_text.call_args[0][0]
@@ -118,39 +196,30 @@ class TestCommandHandler:
         assert "10" in call_text  # system tokens
         assert "60" in call_text  # total tokens
 
-    @pytest.mark.asyncio
-    async def test_info_disallowed(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+    async def test_info_disallowed(self, make_settings: SettingsFactory) -> None:
+        s = make_settings(allowed_users=[1])
         af = AccessFilter(s)
         handler = CommandHandler(af, "testbot")
         update = _update(user_id=99)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.info(update, ctx)
         update.message.reply_text.assert_not_awaited()
 
-    @pytest.mark.asyncio
-    async def test_info_without_mistral_client(self) -> None:
+    async def test_info_without_mistral_client(self, make_settings: SettingsFactory) -> None:
         """info command should still work when no MistralClient is provided."""
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         af = AccessFilter(s)
         handler = CommandHandler(af, "testbot")  # no mistral_client
         update = _update(user_id=1)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.info(update, ctx)
         update.message.reply_text.assert_awaited_once()
         call_text = update.message.reply_text.call_args[0][0]
         assert "1" in call_text  # user_id
 
-    @pytest.mark.asyncio
-    async def test_info_group_chat(self) -> None:
+    async def test_info_group_chat(self, make_settings: SettingsFactory) -> None:
         """info command should use chat_id as context_id in group chats."""
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         s.access.allowed_chat_ids = [100]
         af = AccessFilter(s)
         mistral = MagicMock()
@@ -164,7 +233,7 @@ class TestCommandHandler:
         handler = CommandHandler(af, "testbot", mistral_client=mistral)
         update = _update(user_id=1, chat_type="group")
         update.message.chat.id = 100
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         # Patch access check to pass (access control is tested separately)
         with patch.object(af, "check", return_value=True):
             await handler.info(update, ctx)
@@ -172,61 +241,49 @@ class TestCommandHandler:
         mistral.get_context_info.assert_called_once_with(100)
         update.message.reply_text.assert_awaited_once()
 
-    @pytest.mark.asyncio
-    async def test_clear_allowed(self) -> None:
+    async def test_clear_allowed(self, make_settings: SettingsFactory) -> None:
         """clear command should clear history and send confirmation for allowed user."""
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         af = AccessFilter(s)
         mistral = MagicMock()
         mistral.clear_history = MagicMock()
         handler = CommandHandler(af, "testbot", mistral_client=mistral)
         update = _update(user_id=1)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.clear(update, ctx)
         mistral.clear_history.assert_called_once_with(1)
         update.message.reply_text.assert_awaited_once()
         call_text = update.message.reply_text.call_args[0][0]
         assert "очищена" in call_text
 
-    @pytest.mark.asyncio
-    async def test_clear_disallowed(self) -> None:
+    async def test_clear_disallowed(self, make_settings: SettingsFactory) -> None:
         """clear command should not do anything for disallowed user."""
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         af = AccessFilter(s)
         mistral = MagicMock()
         mistral.clear_history = MagicMock()
         handler = CommandHandler(af, "testbot", mistral_client=mistral)
         update = _update(user_id=99)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.clear(update, ctx)
         mistral.clear_history.assert_not_called()
         update.message.reply_text.assert_not_awaited()
 
-    @pytest.mark.asyncio
-    async def test_clear_without_mistral_client(self) -> None:
+    async def test_clear_without_mistral_client(self, make_settings: SettingsFactory) -> None:
         """clear command should still send confirmation when no MistralClient is provided."""
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         af = AccessFilter(s)
         handler = CommandHandler(af, "testbot")  # no mistral_client
         update = _update(user_id=1)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.clear(update, ctx)
         update.message.reply_text.assert_awaited_once()
         call_text = update.message.reply_text.call_args[0][0]
         assert "очищена" in call_text
 
-    @pytest.mark.asyncio
-    async def test_clear_group_chat(self) -> None:
+    async def test_clear_group_chat(self, make_settings: SettingsFactory) -> None:
         """clear command should use chat_id as context_id in group chats."""
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         s.access.allowed_chat_ids = [100]
         af = AccessFilter(s)
         mistral = MagicMock()
@@ -234,7 +291,7 @@ class TestCommandHandler:
         handler = CommandHandler(af, "testbot", mistral_client=mistral)
         update = _update(user_id=1, chat_type="group")
         update.message.chat.id = 100
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         with patch.object(af, "check", return_value=True):
             await handler.clear(update, ctx)
         mistral.clear_history.assert_called_once_with(100)
@@ -247,12 +304,8 @@ class TestCommandHandler:
 
 
 class TestMessageHandler:
-    @pytest.mark.asyncio
-    async def test_handle_allowed(self) -> None:
-        from src.api.mistral_client import GenerateResponse
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+    async def test_handle_allowed(self, make_settings: SettingsFactory) -> None:
+        s = make_settings(allowed_users=[1])
         # Disable streaming for this test to verify non-streaming path still works
         s.bot.enable_streaming = False
 
@@ -270,43 +323,37 @@ class TestMessageHandler:
         af = AccessFilter(s)
         handler = MessageHandler(s, mistral, af)
 
-        update = _update(user_id=1, text="ping")
         # Make reply_text return a mock message so status edit works
         status_msg = AsyncMock()
-        status_msg.edit_text = AsyncMock()
-        update.message.reply_text = AsyncMock(return_value=status_msg)
+        update = _update(user_id=1, text="ping", reply=status_msg)
         ctx = MagicMock()
-        ctx.bot.send_chat_action = AsyncMock()
+        ctx.bot.send_chat_action = _async_noop
         await handler.handle(update, ctx)
         # First call sends status, second is not needed since edit replaces it
         calls = update.message.reply_text.call_args_list
         assert calls[0][0][0] == s.status_messages.thinking
         # The response is edited into the status message
-        status_msg.edit_text.assert_awaited_once_with(
-            "response text", parse_mode="Markdown"
-        )
-
-    @pytest.mark.asyncio
-    async def test_handle_disallowed(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
-        mistral = MagicMock()
+        assert status_msg.edit_text.await_count == 1
+        args, kwargs = status_msg.edit_text.call_args
+        assert args == ("response text",)
+        assert kwargs == {"parse_mode": "Markdown"}
+
+    async def test_handle_disallowed(
+        self, make_settings: SettingsFactory, stub_mistral: MagicMock
+    ) -> None:
+        s = make_settings(allowed_users=[1])
         af = AccessFilter(s)
-        handler = MessageHandler(s, mistral, af)
+        handler = MessageHandler(s, stub_mistral, af)
 
         update = _update(user_id=99)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.handle(update, ctx)
         update.message.reply_text.assert_not_awaited()
+        stub_mistral.generate.assert_not_awaited()
 
-    @pytest.mark.asyncio
-    async def test_handle_photo_message(self) -> None:
+    async def test_handle_photo_message(self, make_settings: SettingsFactory) -> None:
         """Should pass image_urls to generate when photo is attached."""
-        from src.api.mistral_client import GenerateResponse
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         s.bot.enable_streaming = False
 
         mistral = MagicMock()
@@ -324,43 +371,29 @@ class TestMessageHandler:
         handler = MessageHandler(s, mistral, af)
 
         # Create update with photo
-        update = _update(user_id=1, text="")
+        status_msg = AsyncMock()
+        update = _update(user_id=1, text="", reply=status_msg)
         update.message.text = None
         update.message.caption = "What is this?"
         # Simulate photo: list of PhotoSize objects
         mock_photo = MagicMock()
         mock_photo.file_id = "fake_file_id"
         update.message.photo = [mock_photo]
-        update.message.video = None
-        update.message.audio = None
-        update.message.voice = None
-        update.message.document = None
-        update.message.sticker = None
-        update.message.animation = None
-        update.message.location = None
-        update.message.contact = None
-        update.message.invoice = None
 
         # Mock file download
-        mock_file = AsyncMock()
-        mock_file.download_as_bytearray = AsyncMock(return_value=bytearray(b"\xff\xd8test"))
-
-        status_msg = AsyncMock()
-        status_msg.edit_text = AsyncMock()
-        update.message.reply_text = AsyncMock(return_value=status_msg)
+        mock_file = MagicMock()
+        mock_file.download_as_bytearray = _async_return(_JPEG_BYTES)
 
         ctx = MagicMock()
-        ctx.bot.send_chat_action = AsyncMock()
-        ctx.bot.get_file = AsyncMock(return_value=mock_file)
+        ctx.bot.send_chat_action = _async_noop
+        ctx.bot.get_file = _async_return(mock_file)
 
         await handler.handle(update, ctx)
 
         # Verify generate was called with image_urls
         mistral.generate.assert_awaited_once()
         call_kwargs = mistral.generate.call_args
-        assert call_kwargs.kwargs.get("image_urls") is not None
-        assert len(call_kwargs.kwargs["image_urls"]) == 1
-        assert call_kwargs.kwargs["image_urls"][0].startswith("data:image/jpeg;base64,")
+        assert call_kwargs.kwargs["image_urls"] == [_EXPECTED_JPEG_URL]
 
 
 # ------------------------------------------------------------------
@@ -369,30 +402,41 @@ class TestMessageHandler:
 
 
 class TestAdminHandler:
-    @pytest.mark.asyncio
-    async def test_add_user_as_admin(self, tmp_path) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1])
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
+    @pytest.fixture(scope="class")
+    def make_admin_handler(self, make_settings: SettingsFactory) -> AdminHandlerFactory:
+        """Return a factory wiring fresh settings into an ``AdminHandler``.
+
+        Keyword overrides are applied to ``settings.access`` before the
+        handler is built.
+        """
+
+        def _make(
+            admin_ids: list[int] | None = None,
+            allowed_users: list[int] | None = None,
+            **access_overrides: Any,
+        ) -> tuple[AppSettings, AdminHandler]:
+            s = make_settings(admin_ids=admin_ids, allowed_users=allowed_users)
+            for name, value in access_overrides.items():
+                setattr(s.access, name, value)
+            return s, AdminHandler(s, AccessFilter(s))
+
+        return _make
+
+    @pytest.mark.io
+    async def test_add_user_as_admin(self, make_admin_handler: AdminHandlerFactory) -> None:
+        s, handler = make_admin_handler(admin_ids=[1])
 
         update = _update(user_id=1)
         ctx = MagicMock()
         ctx.args = ["42"]
-        # Use a temp directory so save_access writes to disk without error
-        with patch("src.config.settings.CONFIG_DIR", tmp_path):
-            await handler.add_user(update, ctx)
+        await handler.add_user(update, ctx)
         assert 42 in s.access.allowed_user_ids
         update.message.reply_text.assert_awaited()
 
-    @pytest.mark.asyncio
-    async def test_add_user_rejected_for_non_admin(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1])
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
+    async def test_add_user_rejected_for_non_admin(
+        self, make_admin_handler: AdminHandlerFactory
+    ) -> None:
+        s, handler = make_admin_handler(admin_ids=[1])
 
         update = _update(user_id=99)
         ctx = MagicMock()
@@ -400,157 +444,78 @@ class TestAdminHandler:
         await handler.add_user(update, ctx)
         assert 42 not in s.access.allowed_user_ids
 
-    @pytest.mark.asyncio
-    async def test_list_access(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1], allowed_users=[10, 20])
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
+    async def test_list_access(self, make_admin_handler: AdminHandlerFactory) -> None:
+        _, handler = make_admin_handler(admin_ids=[1], allowed_users=[10, 20])
 
         update = _update(user_id=1)
-        ctx = MagicMock()
+        ctx = _DUMMY_CTX
         await handler.list_access(update, ctx)
         update.message.reply_text.assert_awaited_once()
         call_text = update.message.reply_text.call_args[0][0]
         assert "10" in call_text
         assert "20" in call_text
 
-    @pytest.mark.asyncio
-    async def test_reactions_on_as_admin(self, tmp_path) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1])
-        s.access.reactions_enabled = False
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
-
-        update = _update(user_id=1)
-        ctx = MagicMock()
-        with patch("src.config.settings.CONFIG_DIR", tmp_path):
-            await handler.reactions_on(update, ctx)
-        assert s.access.reactions_enabled is True
-        update.message.reply_text.assert_awaited()
-
-    @pytest.mark.asyncio
-    async def test_reactions_off_as_admin(self, tmp_path) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1])
-        s.access.reactions_enabled = True
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
+    @pytest.mark.io
+    @pytest.mark.parametrize(
+        ("method", "attr", "initial", "expected"),
+        [
+            ("reactions_on", "reactions_enabled", False, True),
+            ("reactions_off", "reactions_enabled", True, False),
+            ("date_on", "always_append_date_enabled", False, True),
+            ("date_off", "always_append_date_enabled", True, False),
+        ],
+    )
+    async def test_toggle_as_admin(
+        self,
+        make_admin_handler: AdminHandlerFactory,
+        method: str,
+        attr: str,
+        initial: bool,
+        expected: bool,
+    ) -> None:
+        s, handler = make_admin_handler(admin_ids=[1], **{attr: initial})
 
         update = _update(user_id=1)
-        ctx = MagicMock()
-        with patch("src.config.settings.CONFIG_DIR", tmp_path):
-            await handler.reactions_off(update, ctx)
-        assert s.access.reactions_enabled is False
+        ctx = _DUMMY_CTX
+        await getattr(handler, method)(update, ctx)
+        assert getattr(s.access, attr) is expected
         update.message.reply_text.assert_awaited()
 
-    @pytest.mark.asyncio
-    async def test_reactions_status_as_admin(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1])
-        s.access.reactions_enabled = True
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
+    @pytest.mark.parametrize(
+        ("method", "attr", "heading"),
+        [
+            ("reactions_status", "reactions_enabled", "Статус реакций"),
+            ("date_status", "always_append_date_enabled", "Статус добавления даты"),
+        ],
+    )
+    async def test_status_as_admin(
+        self, make_admin_handler: AdminHandlerFactory, method: str, attr: str, heading: str
+    ) -> None:
+        _, handler = make_admin_handler(admin_ids=[1], **{attr: True})
 
         update = _update(user_id=1)
-        ctx = MagicMock()
-        await handler.reactions_status(update, ctx)
+        ctx = _DUMMY_CTX
+        await getattr(handler, method)(update, ctx)
         update.message.reply_text.assert_awaited_once()
         call_text = update.message.reply_text.call_args[0][0]
         # Should show status information
-        assert "Статус реакций" in call_text
+        assert heading in call_text
 
-    @pytest.mark.asyncio
-    async def test_reactions_commands_rejected_for_non_admin(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1])
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
+    @pytest.mark.parametrize(
+        "method",
+        ["reactions_on", "reactions_off", "reactions_status", "date_on", "date_off", "date_status"],
+    )
+    async def test_settings_commands_rejected_for_non_admin(
+        self, make_admin_handler: AdminHandlerFactory, method: str
+    ) -> None:
+        _, handler = make_admin_handler(admin_ids=[1])
 
         update = _update(user_id=99)  # Non-admin user
-        ctx = MagicMock()
-
-        # Test all three commands are rejected
-        await handler.reactions_on(update, ctx)
-        await handler.reactions_off(update, ctx)
-        await handler.reactions_status(update, ctx)
-
-        # All should have rejected the user
-        assert update.message.reply_text.call_count == 3
-
-    @pytest.mark.asyncio
-    async def test_date_on_as_admin(self, tmp_path) -> None:
-        from src.bot.filters.access_filter import AccessFilter
+        ctx = _DUMMY_CTX
+        await getattr(handler, method)(update, ctx)
 
-        s = _settings(admin_ids=[1])
-        s.access.always_append_date_enabled = False
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
-
-        update = _update(user_id=1)
-        ctx = MagicMock()
-        with patch("src.config.settings.CONFIG_DIR", tmp_path):
-            await handler.date_on(update, ctx)
-        assert s.access.always_append_date_enabled is True
-        update.message.reply_text.assert_awaited()
-
-    @pytest.mark.asyncio
-    async def test_date_off_as_admin(self, tmp_path) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1])
-        s.access.always_append_date_enabled = True
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
-
-        update = _update(user_id=1)
-        ctx = MagicMock()
-        with patch("src.config.settings.CONFIG_DIR", tmp_path):
-            await handler.date_off(update, ctx)
-        assert s.access.always_append_date_enabled is False
-        update.message.reply_text.assert_awaited()
-
-    @pytest.mark.asyncio
-    async def test_date_status_as_admin(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1])
-        s.access.always_append_date_enabled = True
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
-
-        update = _update(user_id=1)
-        ctx = MagicMock()
-        await handler.date_status(update, ctx)
+        # The user should have been rejected with a single reply
         update.message.reply_text.assert_awaited_once()
-        call_text = update.message.reply_text.call_args[0][0]
-        # Should show status information
-        assert "Статус добавления даты" in call_text
-
-    @pytest.mark.asyncio
-    async def test_date_commands_rejected_for_non_admin(self) -> None:
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(admin_ids=[1])
-        af = AccessFilter(s)
-        handler = AdminHandler(s, af)
-
-        update = _update(user_id=99)  # Non-admin user
-        ctx = MagicMock()
-
-        # Test all three commands are rejected
-        await handler.date_on(update, ctx)
-        await handler.date_off(update, ctx)
-        await handler.date_status(update, ctx)
-
-        # All should have rejected the user
-        assert update.message.reply_text.call_count == 3
 
 
 # ------------------------------------------------------------------
@@ -559,15 +524,8 @@ class TestAdminHandler:
 
 
 class TestErrorHandler:
-    @pytest.mark.asyncio
     async def test_network_error_logs_warning(self, caplog) -> None:
         """NetworkError should be logged at WARNING without re-raising."""
-        import logging
-
-        from telegram.error import NetworkError
-
-        from src.bot.bot import _error_handler
-
         ctx = MagicMock()
         ctx.error = NetworkError("502 Bad Gateway")
 
@@ -577,15 +535,8 @@ class TestErrorHandler:
         assert any("NetworkError" in r.message for r in caplog.records)
         assert all(r.levelno < logging.ERROR for r in caplog.records)
 
-    @pytest.mark.asyncio
     async def test_timed_out_logs_warning(self, caplog) -> None:
         """TimedOut should be logged at WARNING without re-raising."""
-        import logging
-
-        from telegram.error import TimedOut
-
-        from src.bot.bot import _error_handler
-
         ctx = MagicMock()
         ctx.error = TimedOut()
 
@@ -594,15 +545,8 @@ class TestErrorHandler:
 
         assert any("TimedOut" in r.message for r in caplog.records)
 
-    @pytest.mark.asyncio
     async def test_telegram_error_logs_error(self, caplog) -> None:
         """Non-transient TelegramError should be logged at ERROR level."""
-        import logging
-
-        from telegram.error import TelegramError
-
-        from src.bot.bot import _error_handler
-
         ctx = MagicMock()
         ctx.error = TelegramError("some api error")
 
@@ -618,13 +562,9 @@ class TestErrorHandler:
 
 
 class TestSearchUnavailableNotification:
-    @pytest.mark.asyncio
-    async def test_search_unavailable_prepends_notice(self) -> None:
+    async def test_search_unavailable_prepends_notice(self, make_settings: SettingsFactory) -> None:
         """When search_unavailable=True, response should start with the notice."""
-        from src.api.mistral_client import GenerateResponse
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         s.bot.enable_streaming = False
 
         mistral = MagicMock()
@@ -640,25 +580,19 @@ class TestSearchUnavailableNotification:
         af = AccessFilter(s)
         handler = MessageHandler(s, mistral, af)
 
-        update = _update(user_id=1, text="what's new?")
         status_msg = AsyncMock()
-        status_msg.edit_text = AsyncMock()
-        update.message.reply_text = AsyncMock(return_value=status_msg)
+        update = _update(user_id=1, text="what's new?", reply=status_msg)
         ctx = MagicMock()
-        ctx.bot.send_chat_action = AsyncMock()
+        ctx.bot.send_chat_action = _async_noop
         await handler.handle(update, ctx)
 
         # The edited text should include the search-unavailable notice
         edit_call_text = status_msg.edit_text.call_args[0][0]
         assert "Поиск временно недоступен" in edit_call_text
 
-    @pytest.mark.asyncio
-    async def test_no_notice_when_search_available(self) -> None:
+    async def test_no_notice_when_search_available(self, make_settings: SettingsFactory) -> None:
         """When search_unavailable=False, no notice should be prepended."""
-        from src.api.mistral_client import GenerateResponse
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         s.bot.enable_streaming = False
 
         mistral = MagicMock()
@@ -674,12 +608,10 @@ class TestSearchUnavailableNotification:
         af = AccessFilter(s)
         handler = MessageHandler(s, mistral, af)
 
-        update = _update(user_id=1, text="hello")
         status_msg = AsyncMock()
-        status_msg.edit_text = AsyncMock()
-        update.message.reply_text = AsyncMock(return_value=status_msg)
+        update = _update(user_id=1, text="hello", reply=status_msg)
         ctx = MagicMock()
-        ctx.bot.send_chat_action = AsyncMock()
+        ctx.bot.send_chat_action = _async_noop
         await handler.handle(update, ctx)
 
         edit_call_text = status_msg.edit_text.call_args[0][0]
@@ -692,33 +624,26 @@ class TestSearchUnavailableNotification:
 
 
 class TestTypingIndicator:
-    @pytest.mark.asyncio
     async def test_send_typing_periodically_sends_action_after_interval(self) -> None:
         """_send_typing_periodically should sleep first and then call send_chat_action."""
-        import asyncio
-
+        sent = asyncio.Event()
         bot = MagicMock()
-        bot.send_chat_action = AsyncMock()
+        bot.send_chat_action = AsyncMock(side_effect=lambda **kwargs: sent.set())
 
         # Use a tiny but non-zero interval to better simulate real timing
-        task = asyncio.create_task(_send_typing_periodically(bot, chat_id=42, interval=0.01))
-        # Wait for the interval to elapse and the action to fire
-        await asyncio.sleep(0.05)
+        task = asyncio.create_task(_send_typing_periodically(bot, chat_id=42, interval=0.001))
+        # Return as soon as the action fires instead of sleeping a fixed amount
+        await asyncio.wait_for(sent.wait(), timeout=1.0)
         task.cancel()
         try:
             await task
         except asyncio.CancelledError:
             pass
 
-        bot.send_chat_action.assert_awaited_with(
-            chat_id=42, action=pytest.importorskip("telegram").constants.ChatAction.TYPING
-        )
+        bot.send_chat_action.assert_awaited_with(chat_id=42, action=ChatAction.TYPING)
 
-    @pytest.mark.asyncio
     async def test_send_typing_periodically_does_not_send_before_interval(self) -> None:
         """_send_typing_periodically should NOT call send_chat_action before the interval."""
-        import asyncio
-
         bot = MagicMock()
         bot.send_chat_action = AsyncMock()
 
@@ -734,33 +659,18 @@ class TestTypingIndicator:
 
         bot.send_chat_action.assert_not_awaited()
 
-    @pytest.mark.asyncio
-    async def test_handle_sends_typing_action(self) -> None:
+    async def test_handle_sends_typing_action(
+        self, make_settings: SettingsFactory, stub_mistral: MagicMock
+    ) -> None:
         """handle() must call send_chat_action with TYPING before generating a response."""
-        from telegram.constants import ChatAction
-
-        from src.api.mistral_client import GenerateResponse
-        from src.bot.filters.access_filter import AccessFilter
-
-        s = _settings(allowed_users=[1])
+        s = make_settings(allowed_users=[1])
         s.bot.enable_streaming = False
 
-        mistral = MagicMock()
-        mistral.generate = AsyncMock(
-            return_value=GenerateResponse(
-                content="hello",
-                model="mistral-small-latest",
-            )
-        )
-        mistral._web_search = None
-        mistral._should_use_web_search = MagicMock(return_value=False)
         af = AccessFilter(s)
-        handler = MessageHandler(s, mistral, af)
+        handler = MessageHandler(s, stub_mistral, af)
 
-        update = _update(user_id=1, text="hi")
         status_msg = AsyncMock()
-        status_msg.edit_text = AsyncMock()
-        update.message.reply_text = AsyncMock(return_value=status_msg)
+        update = _update(user_id=1, text="hi", reply=status_msg)
         ctx = MagicMock()
         ctx.bot.send_chat_action = AsyncMock()
 
@@ -2,79 +2,121 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
+from src.api.conversation_memory import ConversationMemory
 from src.api.mistral_client import GenerateResponse, MistralClient
 from src.api.model_selector import requires_current_date
 from src.config.settings import AccessSettings, AppSettings, MistralSettings
 
+ChatClientFactory = Callable[..., SimpleNamespace]
+
+
+# Hardcoded, known-valid values: skip validation and environment loading.
+_BASE_SETTINGS = AppSettings.model_construct(
+    mistral_api_key="fake-key",
+    mistral=MistralSettings.model_construct(model="mistral-small-latest"),
+    access=AccessSettings.model_construct(),
+)
+
+
+@lru_cache(maxsize=None)
+def _cached_settings(
+    mistral_overrides: frozenset[tuple[str, Any]] = frozenset(),
+    access_overrides: frozenset[tuple[str, Any]] = frozenset(),
+) -> AppSettings:
+    """Derive each distinct settings shape from the base once."""
+    if not mistral_overrides and not access_overrides:
+        return _BASE_SETTINGS
+    return _BASE_SETTINGS.model_copy(
+        update={
+            "mistral": _BASE_SETTINGS.mistral.model_copy(update=dict(mistral_overrides)),
+            "access": _BASE_SETTINGS.access.model_copy(update=dict(access_overrides)),
+        }
+    )
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def settings() -> AppSettings:
-    return AppSettings(
-        mistral_api_key="fake-key",
-        mistral=MistralSettings(model="mistral-small-latest"),
-    )
+    return _cached_settings()
 
 
-def test_requires_current_date_with_date_keywords() -> None:
-    """requires_current_date() should return True for queries about current date."""
-    assert requires_current_date("What happened today?")
-    assert requires_current_date("Какие новости сегодня?")
-    assert requires_current_date("Какая будет погода завтра?")
-    assert requires_current_date("What's the current exchange rate?")
-    assert requires_current_date("Покажи последние новости")
+@pytest.fixture(scope="module", autouse=True)
+def _mistral_patch() -> Iterator[MagicMock]:
+    """Patch the Mistral SDK class once for every test in the module."""
+    with patch("src.api.mistral_client.Mistral") as mock_mistral:
+        yield mock_mistral
+
+
+@pytest.fixture
+def mock_mistral(_mistral_patch: MagicMock) -> MagicMock:
+    """Hand each test the shared Mistral mock with its calls and return value cleared."""
+    _mistral_patch.reset_mock(return_value=True, side_effect=True)
+    return _mistral_patch
+
 
+DATE_QUERIES = [
+    "What happened today?",
+    "Какие новости сегодня?",
+    "Какая будет погода завтра?",
+    "What's the current exchange rate?",
+    "Покажи последние новости",
+]
 
-def test_requires_current_date_without_date_keywords() -> None:
-    """requires_current_date() should return False for queries that don't need current date."""
-    assert not requires_current_date("What is Python?")
-    assert not requires_current_date("Напиши функцию")
-    assert not requires_current_date("Как работает интернет?")
-    assert not requires_current_date("Write a poem about love")
+NO_DATE_QUERIES = [
+    "What is Python?",
+    "Напиши функцию",
+    "Как работает интернет?",
+    "Write a poem about love",
+]
+
+
+class TestRequiresCurrentDate:
+    @pytest.mark.parametrize("query", DATE_QUERIES)
+    def test_with_date_keywords(self, query: str) -> None:
+        """requires_current_date() should return True for queries about current date."""
+        assert requires_current_date(query)
+
+    @pytest.mark.parametrize("query", NO_DATE_QUERIES)
+    def test_without_date_keywords(self, query: str) -> None:
+        """requires_current_date() should return False for queries that don't need current date."""
+        assert not requires_current_date(query)
 
 
-@patch("src.api.mistral_client.Mistral")
 def test_client_init(mock_mistral: MagicMock, settings: AppSettings) -> None:
     """Client should initialize Mistral with the API key."""
     MistralClient(settings)
     mock_mistral.assert_called_once_with(api_key="fake-key")
 
 
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate(mock_mistral: MagicMock, settings: AppSettings) -> None:
+async def test_generate(
+    mock_mistral: MagicMock, make_chat_client: ChatClientFactory, settings: AppSettings
+) -> None:
     """generate() should return GenerateResponse with model text and metadata."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "Hello from Mistral!"
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    # Mock usage information
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 10
-    mock_usage.completion_tokens = 15
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_client.aclose = AsyncMock()
-    mock_mistral.return_value = mock_client
+    mock_client = make_chat_client(
+        mock_mistral, "Hello from Mistral!", prompt_tokens=10, completion_tokens=15
+    )
 
     client = MistralClient(settings)
     result = await client.generate("Hi")
-    # Check result is GenerateResponse
-    assert isinstance(result, GenerateResponse)
-    assert result.content == "Hello from Mistral!"
-    assert result.input_tokens == 10
-    assert result.output_tokens == 15
+    assert result == GenerateResponse(
+        content="Hello from Mistral!",
+        model="mistral-small-latest",
+        input_tokens=10,
+        output_tokens=15,
+    )
     assert result.total_tokens == 25
 
     # Verify that complete_async was called with the expected arguments
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
+    (kwargs,) = mock_client.chat.complete_async.calls
     # Model should be dynamically selected (mistral-small-latest for simple query)
     assert kwargs["model"] == "mistral-small-latest"
     # Ensure the user message content is correctly forwarded
@@ -89,595 +131,303 @@ async def test_generate(mock_mistral: MagicMock, settings: AppSettings) -> None:
     assert kwargs["temperature"] == settings.mistral.temperature
 
 
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_with_system_prompt(mock_mistral: MagicMock) -> None:
-    """generate() should include system message when system_prompt is configured."""
-    settings = AppSettings(
-        mistral_api_key="fake-key",
-        mistral=MistralSettings(
-            model="mistral-small-latest", system_prompt="You are a helpful assistant."
-        ),
-    )
+_FROZEN_NOW = datetime(2031, 6, 15, 12, 30)
 
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "I'm here to help!"
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 5
-    mock_usage.completion_tokens = 8
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_client.aclose = AsyncMock()
-    mock_mistral.return_value = mock_client
-
-    client = MistralClient(settings)
-    result = await client.generate("Hi")
-    assert isinstance(result, GenerateResponse)
-    assert result.content == "I'm here to help!"
 
-    # Verify messages include both system and user
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
-    messages = kwargs["messages"]
-    assert len(messages) == 2
-    # First message should be system
-    assert messages[0].role == "system"
-    # System message should contain only the configured prompt
-    assert "You are a helpful assistant." in messages[0].content
-    # Second message should be user
-    assert messages[1].role == "user"
-    assert messages[1].content == "Hi"
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_with_date_context(mock_mistral: MagicMock) -> None:
-    """generate() should add current date to system prompt for time-sensitive queries."""
-    settings = AppSettings(
-        mistral_api_key="fake-key",
-        mistral=MistralSettings(model="mistral-small-latest"),
-    )
+class _FrozenDatetime(datetime):
+    """``datetime`` whose ``now()`` is pinned to ``_FROZEN_NOW``."""
 
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "Today is a great day!"
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 12
-    mock_usage.completion_tokens = 6
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_client.aclose = AsyncMock()
-    mock_mistral.return_value = mock_client
-
-    client = MistralClient(settings)
-    # Query that requires date context (contains "today")
-    result = await client.generate("What happened today?", user_id=123)
-    assert isinstance(result, GenerateResponse)
-    assert result.content == "Today is a great day!"
-
-    # Verify that date was added to system prompt
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
-    messages = kwargs["messages"]
-    # First message should be system message with date
-    assert messages[0].role == "system"
-    # Check for date/instruction in English (more explicit)
-    assert "CURRENT YEAR" in messages[0].content or "CRITICAL CONTEXT" in messages[0].content
-
-    # Also verify that date context was added to conversation memory
-    history = client._memory.get_history(123)
-    # Should have system context with date
-    system_messages = [msg for msg in history if msg["role"] == "system"]
-    assert len(system_messages) > 0
-    assert "Current date:" in system_messages[0]["content"]
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_without_date_context(
-    mock_mistral: MagicMock,
-    settings: AppSettings,
-) -> None:
-    """generate() should NOT add date for queries that don't need current date."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "Python is great!"
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 8
-    mock_usage.completion_tokens = 4
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_client.aclose = AsyncMock()
-    mock_mistral.return_value = mock_client
+    @classmethod
+    def now(cls, tz: tzinfo | None = None) -> datetime:  # type: ignore[override]
+        return _FROZEN_NOW
 
-    client = MistralClient(settings)
-    # Query that does NOT require date (simple question)
-    result = await client.generate("What is Python?")
-    assert isinstance(result, GenerateResponse)
-    assert result.content == "Python is great!"
 
-    # Verify that date was NOT added to system prompt
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
-    messages = kwargs["messages"]
-    # System message should not contain date
-    if len(messages) > 0 and messages[0].role == "system":
-        assert "CURRENT YEAR" not in messages[0].content
-        assert "CRITICAL CONTEXT" not in messages[0].content
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_with_always_append_date_enabled(mock_mistral: MagicMock) -> None:
-    """generate() should add date when always_append_date config and runtime are both True."""
-    from src.config.settings import AccessSettings
-
-    settings = AppSettings(
-        mistral_api_key="fake-key",
-        mistral=MistralSettings(
-            model="mistral-small-latest",
-            system_prompt="You are helpful.",
-            always_append_date=True,
+@pytest.fixture
+def frozen_now(monkeypatch: pytest.MonkeyPatch) -> datetime:
+    """Pin the clock the client reads for its date context."""
+    monkeypatch.setattr("src.api.mistral_client.datetime", _FrozenDatetime)
+    return _FROZEN_NOW
+
+
+@dataclass(frozen=True)
+class _GenerateCase:
+    """One generate() scenario: settings overrides, prompt and expectations."""
+
+    prompt: str
+    mistral: dict[str, Any] = field(default_factory=dict)
+    access: dict[str, Any] = field(default_factory=dict)
+    user_id: int | None = None
+    model: str | None = None
+    system_includes: tuple[str, ...] = ()
+    system_excludes: tuple[str, ...] = ()
+    date_in_memory: bool = False
+
+
+_NO_DATE = ("CURRENT YEAR", "CRITICAL CONTEXT")
+_DATE = (*_NO_DATE, "TODAY: 15 июня 2031 года (2031)", "CURRENT YEAR: 2031", "TIME: 12:30")
+
+GENERATE_CASES = [
+    pytest.param(
+        _GenerateCase(
+            prompt="Hi",
+            mistral={"system_prompt": "You are a helpful assistant."},
+            system_includes=("You are a helpful assistant.",),
+            system_excludes=(*_NO_DATE, "REASONING MODE"),
         ),
-        access=AccessSettings(always_append_date_enabled=True),
-    )
-
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "Python is great!"
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 15
-    mock_usage.completion_tokens = 5
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_mistral.return_value = mock_client
-
-    client = MistralClient(settings)
-    # Query that does NOT contain date keywords, but flag is enabled
-    result = await client.generate("What is Python?", user_id=456)
-    assert isinstance(result, GenerateResponse)
-    assert result.content == "Python is great!"
-
-    # Verify that date was added to system prompt despite no date keywords
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
-    messages = kwargs["messages"]
-    # First message should be system message with date
-    assert messages[0].role == "system"
-    assert "You are helpful." in messages[0].content
-    assert "CURRENT YEAR" in messages[0].content
-    assert "CRITICAL CONTEXT" in messages[0].content
-
-    # Verify date was added to conversation memory
-    history = client._memory.get_history(456)
-    system_messages = [msg for msg in history if msg["role"] == "system"]
-    assert len(system_messages) > 0
-    assert "Current date:" in system_messages[0]["content"]
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_with_always_append_date_disabled(mock_mistral: MagicMock) -> None:
-    """generate() should NOT add date when always_append_date is False and no keywords."""
-    settings = AppSettings(
-        mistral_api_key="fake-key",
-        mistral=MistralSettings(
-            model="mistral-small-latest",
-            always_append_date=False,  # Explicitly disabled
+        id="system_prompt",
+    ),
+    pytest.param(
+        _GenerateCase(
+            prompt="What happened today?",
+            user_id=123,
+            system_includes=_DATE,
+            date_in_memory=True,
         ),
-    )
-
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "Python is great!"
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 8
-    mock_usage.completion_tokens = 4
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_mistral.return_value = mock_client
-
-    client = MistralClient(settings)
-    # Query without date keywords and flag disabled
-    result = await client.generate("What is Python?")
-    assert isinstance(result, GenerateResponse)
-    assert result.content == "Python is great!"
-
-    # Verify that date was NOT added
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
-    messages = kwargs["messages"]
-    # System message should not contain date
-    if len(messages) > 0 and messages[0].role == "system":
-        assert "CURRENT YEAR" not in messages[0].content
-        assert "CRITICAL CONTEXT" not in messages[0].content
+        id="date_keyword",
+    ),
+    pytest.param(
+        _GenerateCase(prompt="What is Python?", system_excludes=_NO_DATE),
+        id="no_date_keyword",
+    ),
+    pytest.param(
+        _GenerateCase(
+            prompt="What is Python?",
+            mistral={"system_prompt": "You are helpful.", "always_append_date": True},
+            access={"always_append_date_enabled": True},
+            user_id=456,
+            system_includes=("You are helpful.", *_DATE),
+            date_in_memory=True,
+        ),
+        id="always_append_date_enabled",
+    ),
+    pytest.param(
+        _GenerateCase(
+            prompt="What is Python?",
+            mistral={"always_append_date": False},
+            system_excludes=_NO_DATE,
+        ),
+        id="always_append_date_disabled",
+    ),
+    pytest.param(
+        _GenerateCase(
+            prompt="What is Python?",
+            mistral={"always_append_date": True},
+            access={"always_append_date_enabled": False},
+            system_excludes=_NO_DATE,
+        ),
+        id="always_append_date_runtime_disabled",
+    ),
+    pytest.param(
+        _GenerateCase(prompt="Write a Python function to sort a list", model="codestral-latest"),
+        id="code_request",
+    ),
+    pytest.param(
+        _GenerateCase(
+            prompt="Analyze step by step why this approach works",
+            model="mistral-medium-latest",
+        ),
+        id="complex_request",
+    ),
+    pytest.param(
+        _GenerateCase(
+            prompt="Explain quantum entanglement",
+            mistral={"reasoning_mode": True},
+            access={"reasoning_mode_enabled": True},
+            system_includes=("REASONING MODE", "шаг за шагом"),
+        ),
+        id="reasoning_mode_enabled",
+    ),
+    pytest.param(
+        _GenerateCase(
+            prompt="Explain quantum entanglement",
+            system_excludes=("REASONING MODE",),
+        ),
+        id="reasoning_mode_default_off",
+    ),
+    pytest.param(
+        _GenerateCase(
+            prompt="Explain quantum entanglement",
+            mistral={"reasoning_mode": True},
+            access={"reasoning_mode_enabled": False},
+            system_excludes=("REASONING MODE",),
+        ),
+        id="reasoning_mode_runtime_disabled",
+    ),
+    pytest.param(
+        _GenerateCase(
+            prompt="What is 2+2?",
+            mistral={"system_prompt": "You are a helpful assistant.", "reasoning_mode": True},
+            access={"reasoning_mode_enabled": True},
+            system_includes=("You are a helpful assistant.", "REASONING MODE"),
+        ),
+        id="reasoning_mode_with_system_prompt",
+    ),
+]
 
 
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_with_always_append_date_runtime_disabled(
-    mock_mistral: MagicMock,
+@pytest.mark.parametrize("case", GENERATE_CASES)
+@pytest.mark.usefixtures("frozen_now")
+async def test_generate_variants(
+    mock_mistral: MagicMock, make_chat_client: ChatClientFactory, case: _GenerateCase
 ) -> None:
-    """generate() should NOT add date when config is True but runtime toggle is False."""
-    from src.config.settings import AccessSettings
-
-    settings = AppSettings(
-        mistral_api_key="fake-key",
-        mistral=MistralSettings(
-            model="mistral-small-latest",
-            always_append_date=True,  # Config enabled
-        ),
-        access=AccessSettings(always_append_date_enabled=False),  # Runtime disabled
+    """generate() should shape the system prompt and pick the model per settings and prompt."""
+    settings = _cached_settings(
+        frozenset(case.mistral.items()), frozenset(case.access.items())
     )
-
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "Python is great!"
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 8
-    mock_usage.completion_tokens = 4
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_mistral.return_value = mock_client
+    mock_client = make_chat_client(mock_mistral)
 
     client = MistralClient(settings)
-    # Query without date keywords
-    result = await client.generate("What is Python?")
+    # Spy on the real method so memory still behaves normally during generate()
+    with patch.object(
+        ConversationMemory,
+        "add_system_context",
+        autospec=True,
+        side_effect=ConversationMemory.add_system_context,
+    ) as add_system_context:
+        result = await client.generate(case.prompt, user_id=case.user_id)
     assert isinstance(result, GenerateResponse)
-    assert result.content == "Python is great!"
+    assert result.content == "ok"
 
-    # Verify that date was NOT added (runtime toggle overrides config)
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
+    (kwargs,) = mock_client.chat.complete_async.calls
     messages = kwargs["messages"]
-    # System message should not contain date
-    if len(messages) > 0 and messages[0].role == "system":
-        assert "CURRENT YEAR" not in messages[0].content
-        assert "CRITICAL CONTEXT" not in messages[0].content
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_code_request(mock_mistral: MagicMock, settings: AppSettings) -> None:
-    """generate() should select code model for code-related queries."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "def hello(): print('hi')"
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 15
-    mock_usage.completion_tokens = 10
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_mistral.return_value = mock_client
+    # The current user message always goes last
+    assert messages[-1].role == "user"
+    assert messages[-1].content == case.prompt
+    if case.model is not None:
+        assert kwargs["model"] == case.model
+
+    system_content = messages[0].content if messages[0].role == "system" else ""
+    for expected in case.system_includes:
+        assert expected in system_content
+    for unexpected in case.system_excludes:
+        assert unexpected not in system_content
+
+    if case.date_in_memory:
+        add_system_context.assert_called_once_with(
+            ANY, case.user_id, "Current date: 15 июня 2031 года. Current time: 12:30."
+        )
+    else:
+        add_system_context.assert_not_called()
 
-    client = MistralClient(settings)
-    result = await client.generate("Write a Python function to sort a list")
-    assert isinstance(result, GenerateResponse)
-    assert result.content == "def hello(): print('hi')"
-
-    # Verify that codestral model was selected
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
-    assert kwargs["model"] == "codestral-latest"
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_complex_request(mock_mistral: MagicMock, settings: AppSettings) -> None:
-    """generate() should select medium model for complex reasoning queries."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = "Detailed analysis..."
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 20
-    mock_usage.completion_tokens = 30
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_mistral.return_value = mock_client
-
-    client = MistralClient(settings)
-    result = await client.generate("Analyze step by step why this approach works")
-    assert isinstance(result, GenerateResponse)
-    assert result.content == "Detailed analysis..."
-
-    # Verify that medium model was selected
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
-    assert kwargs["model"] == "mistral-medium-latest"
 
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
 async def test_generate_error(mock_mistral: MagicMock, settings: AppSettings) -> None:
     """generate() should propagate exceptions."""
-    mock_client = MagicMock()
-    mock_client.chat.complete_async = AsyncMock(side_effect=RuntimeError("API down"))
-    mock_mistral.return_value = mock_client
+    async def _raise(**kwargs: Any) -> None:
+        raise RuntimeError("API down")
+
+    mock_mistral.return_value = SimpleNamespace(chat=SimpleNamespace(complete_async=_raise))
 
     client = MistralClient(settings)
     with pytest.raises(RuntimeError, match="API down"):
         await client.generate("Hi")
 
 
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
 async def test_generate_empty_choices(mock_mistral: MagicMock, settings: AppSettings) -> None:
     """generate() should raise ValueError if API returns no choices."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_response.choices = []
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_mistral.return_value = mock_client
-
-    client = MistralClient(settings)
-    with pytest.raises(ValueError, match="no choices"):
-        await client.generate("Hi")
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_missing_content(mock_mistral: MagicMock, settings: AppSettings) -> None:
-    """generate() should raise ValueError if API returns no message content."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = None
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 5
-    mock_usage.completion_tokens = 0
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_mistral.return_value = mock_client
-
-    client = MistralClient(settings)
-    with pytest.raises(ValueError, match="no message content"):
-        await client.generate("Hi")
+    async def _no_choices(**kwargs: Any) -> SimpleNamespace:
+        return SimpleNamespace(choices=[])
 
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_non_string_content(mock_mistral: MagicMock, settings: AppSettings) -> None:
-    """generate() should raise TypeError if API returns non-string content."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = 123  # Non-string content
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 5
-    mock_usage.completion_tokens = 0
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_mistral.return_value = mock_client
+    mock_mistral.return_value = SimpleNamespace(chat=SimpleNamespace(complete_async=_no_choices))
 
     client = MistralClient(settings)
-    with pytest.raises(TypeError, match="non-string"):
+    with pytest.raises(ValueError, match="no choices"):
         await client.generate("Hi")
 
 
-@patch("src.api.mistral_client.Mistral")
-def test_should_use_web_search_with_explicit_search_requests(
-    mock_mistral: MagicMock, settings: AppSettings
+@pytest.mark.parametrize(
+    ("content", "exc", "match"),
+    [
+        pytest.param(None, ValueError, "no message content", id="missing_content"),
+        pytest.param(123, TypeError, "non-string", id="non_string_content"),
+    ],
+)
+async def test_generate_raises_on_bad_content(
+    mock_mistral: MagicMock,
+    make_chat_client: ChatClientFactory,
+    settings: AppSettings,
+    content: object,
+    exc: type[Exception],
+    match: str,
 ) -> None:
-    """_should_use_web_search() should return True for explicit search requests."""
-    client = MistralClient(settings)
+    """generate() should reject a response whose message content is missing or not a string."""
+    make_chat_client(mock_mistral, content)
 
-    # Russian explicit search requests
-    assert client._should_use_web_search("поищи ка информацию в сети")
-    assert client._should_use_web_search("найди информацию о Python")
-    assert client._should_use_web_search("поиск новостей")
-    assert client._should_use_web_search("искать статьи")
-    assert client._should_use_web_search("погугли это")
-    assert client._should_use_web_search("узнай что такое")
-    assert client._should_use_web_search("посмотри в интернете")
-    assert client._should_use_web_search("проверь онлайн")
-
-    # English explicit search requests
-    assert client._should_use_web_search("search for information")
-    assert client._should_use_web_search("find information about AI")
-    assert client._should_use_web_search("find articles about AI")
-    assert client._should_use_web_search("look up recent news")
-    assert client._should_use_web_search("google this")
-    assert client._should_use_web_search("check online")
-    assert client._should_use_web_search("search online")
-    assert client._should_use_web_search("search the internet")
-
-
-@patch("src.api.mistral_client.Mistral")
-def test_should_use_web_search_with_time_sensitive_queries(
-    mock_mistral: MagicMock, settings: AppSettings
-) -> None:
-    """_should_use_web_search() should return True for time-sensitive queries."""
     client = MistralClient(settings)
-
-    # Time-sensitive queries
-    assert client._should_use_web_search("какие новости сегодня?")
-    assert client._should_use_web_search("текущая погода")
-    assert client._should_use_web_search("последние события")
-    assert client._should_use_web_search("что сейчас происходит")
-    assert client._should_use_web_search("актуальный курс доллара")
-    assert client._should_use_web_search("latest news")
-    assert client._should_use_web_search("current weather")
-    assert client._should_use_web_search("what happened today")
+    with pytest.raises(exc, match=match):
+        await client.generate("Hi")
 
 
-@patch("src.api.mistral_client.Mistral")
-def test_should_use_web_search_without_search_keywords(
-    mock_mistral: MagicMock, settings: AppSettings
-) -> None:
-    """_should_use_web_search() should return False for queries without search keywords."""
-    client = MistralClient(settings)
-
+# Russian and English explicit search requests
+EXPLICIT_SEARCH_QUERIES = [
+    "поищи ка информацию в сети",
+    "найди информацию о Python",
+    "поиск новостей",
+    "искать статьи",
+    "погугли это",
+    "узнай что такое",
+    "посмотри в интернете",
+    "проверь онлайн",
+    "search for information",
+    "find information about AI",
+    "find articles about AI",
+    "look up recent news",
+    "google this",
+    "check online",
+    "search online",
+    "search the internet",
+]
+
+TIME_SENSITIVE_QUERIES = [
+    "какие новости сегодня?",
+    "текущая погода",
+    "последние события",
+    "что сейчас происходит",
+    "актуальный курс доллара",
+    "latest news",
+    "current weather",
+    "what happened today",
+]
+
+NO_SEARCH_QUERIES = [
     # General knowledge questions that don't need web search
-    assert not client._should_use_web_search("что такое Python?")
-    assert not client._should_use_web_search("объясни алгоритм сортировки")
-    assert not client._should_use_web_search("напиши функцию")
-    assert not client._should_use_web_search("расскажи про квантовую физику")
-    assert not client._should_use_web_search("What is machine learning?")
-    assert not client._should_use_web_search("Write a poem")
-    assert not client._should_use_web_search("Tell me about history")
-
+    "что такое Python?",
+    "объясни алгоритм сортировки",
+    "напиши функцию",
+    "расскажи про квантовую физику",
+    "What is machine learning?",
+    "Write a poem",
+    "Tell me about history",
     # Edge cases that contain broad keywords but should not trigger web search.
     # These help ensure we don't introduce unnecessary web searches (false positives).
-    assert not client._should_use_web_search("Can you check this code for errors?")
-    assert not client._should_use_web_search("I find Python very interesting")
-    assert not client._should_use_web_search("The system is online now")
-    assert not client._should_use_web_search("посмотри на этот код")
-    assert not client._should_use_web_search("проверь этот код")
-    assert not client._should_use_web_search("I can't find my keys")
+    "Can you check this code for errors?",
+    "I find Python very interesting",
+    "The system is online now",
+    "посмотри на этот код",
+    "проверь этот код",
+    "I can't find my keys",
+]
 
 
-# ---------------------------------------------------------------------------
-# Reasoning mode (chain-of-thought) tests
-# ---------------------------------------------------------------------------
-
-
-def _mock_client_with_response(mock_mistral: MagicMock, content: str = "ok") -> MagicMock:
-    """Create a mock Mistral client that returns *content* from complete_async."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_message = MagicMock()
-    mock_message.content = content
-    mock_choice = MagicMock()
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_usage = MagicMock()
-    mock_usage.prompt_tokens = 5
-    mock_usage.completion_tokens = 5
-    mock_response.usage = mock_usage
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_mistral.return_value = mock_client
-    return mock_client
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_with_reasoning_mode_enabled(mock_mistral: MagicMock) -> None:
-    """generate() should add CoT instruction to system prompt when reasoning mode is active."""
-    settings = AppSettings(
-        mistral_api_key="fake-key",
-        mistral=MistralSettings(model="mistral-small-latest", reasoning_mode=True),
-        access=AccessSettings(reasoning_mode_enabled=True),
-    )
-    mock_client = _mock_client_with_response(mock_mistral)
+class TestShouldUseWebSearch:
+    @pytest.fixture(scope="class")
+    def client(self, _mistral_patch: MagicMock, settings: AppSettings) -> MistralClient:
+        """One MistralClient shared by the read-only keyword-detection tests."""
+        return MistralClient(settings)
 
-    client = MistralClient(settings)
-    result = await client.generate("Explain quantum entanglement")
-
-    assert isinstance(result, GenerateResponse)
+    @pytest.mark.parametrize("query", EXPLICIT_SEARCH_QUERIES)
+    def test_explicit_search_requests(self, client: MistralClient, query: str) -> None:
+        """_should_use_web_search() should return True for explicit search requests."""
+        assert client._should_use_web_search(query)
 
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
-    messages = kwargs["messages"]
-    # System message must be present and contain the CoT instruction
-    assert messages[0].role == "system"
-    assert "REASONING MODE" in messages[0].content
-    assert "шаг за шагом" in messages[0].content
+    @pytest.mark.parametrize("query", TIME_SENSITIVE_QUERIES)
+    def test_time_sensitive_queries(self, client: MistralClient, query: str) -> None:
+        """_should_use_web_search() should return True for time-sensitive queries."""
+        assert client._should_use_web_search(query)
 
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_without_reasoning_mode(
-    mock_mistral: MagicMock, settings: AppSettings
-) -> None:
-    """generate() should NOT add CoT instruction when reasoning mode is disabled."""
-    mock_client = _mock_client_with_response(mock_mistral)
-
-    client = MistralClient(settings)  # reasoning_mode defaults to False
-    result = await client.generate("Explain quantum entanglement")
-
-    assert isinstance(result, GenerateResponse)
-
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
-    messages = kwargs["messages"]
-    system_content = messages[0].content if messages and messages[0].role == "system" else ""
-    assert "REASONING MODE" not in system_content
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_reasoning_mode_config_on_runtime_off(mock_mistral: MagicMock) -> None:
-    """generate() should NOT add CoT when config is True but runtime toggle is False."""
-    settings = AppSettings(
-        mistral_api_key="fake-key",
-        mistral=MistralSettings(model="mistral-small-latest", reasoning_mode=True),
-        access=AccessSettings(reasoning_mode_enabled=False),  # Runtime disabled
-    )
-    mock_client = _mock_client_with_response(mock_mistral)
-
-    client = MistralClient(settings)
-    result = await client.generate("Explain quantum entanglement")
-
-    assert isinstance(result, GenerateResponse)
-
-    _, kwargs = mock_client.chat.complete_async.call_args
-    messages = kwargs["messages"]
-    system_content = messages[0].content if messages and messages[0].role == "system" else ""
-    assert "REASONING MODE" not in system_content
-
-
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_reasoning_mode_with_existing_system_prompt(mock_mistral: MagicMock) -> None:
-    """CoT instruction should be appended after any existing system prompt."""
-    settings = AppSettings(
-        mistral_api_key="fake-key",
-        mistral=MistralSettings(
-            model="mistral-small-latest",
-            system_prompt="You are a helpful assistant.",
-            reasoning_mode=True,
-        ),
-        access=AccessSettings(reasoning_mode_enabled=True),
-    )
-    mock_client = _mock_client_with_response(mock_mistral)
-
-    client = MistralClient(settings)
-    await client.generate("What is 2+2?")
-
-    _, kwargs = mock_client.chat.complete_async.call_args
-    messages = kwargs["messages"]
-    system_content = messages[0].content
-    assert "You are a helpful assistant." in system_content
-    assert "REASONING MODE" in system_content
+    @pytest.mark.parametrize("query", NO_SEARCH_QUERIES)
+    def test_without_search_keywords(self, client: MistralClient, query: str) -> None:
+        """_should_use_web_search() should return False for queries without search keywords."""
+        assert not client._should_use_web_search(query)
 
 
 # ---------------------------------------------------------------------------
@@ -685,11 +435,11 @@ async def test_generate_reasoning_mode_with_existing_system_prompt(mock_mistral:
 # ---------------------------------------------------------------------------
 
 
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_with_images(mock_mistral: MagicMock, settings: AppSettings) -> None:
+async def test_generate_with_images(
+    mock_mistral: MagicMock, make_chat_client: ChatClientFactory, settings: AppSettings
+) -> None:
     """generate() should use pixtral model and multimodal content when images are provided."""
-    mock_client = _mock_client_with_response(mock_mistral, content="I see a cat")
+    mock_client = make_chat_client(mock_mistral, content="I see a cat")
 
     client = MistralClient(settings)
     result = await client.generate(
@@ -699,8 +449,7 @@ async def test_generate_with_images(mock_mistral: MagicMock, settings: AppSettin
     assert isinstance(result, GenerateResponse)
     assert result.content == "I see a cat"
 
-    mock_client.chat.complete_async.assert_called_once()
-    _, kwargs = mock_client.chat.complete_async.call_args
+    (kwargs,) = mock_client.chat.complete_async.calls
     # Should select pixtral model for vision
     assert kwargs["model"] == "pixtral-12b-latest"
     # Last message should have multimodal content (list of chunks)
@@ -711,18 +460,16 @@ async def test_generate_with_images(mock_mistral: MagicMock, settings: AppSettin
     assert user_msg.content[1].image_url == "data:image/jpeg;base64,dGVzdA=="
 
 
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
 async def test_generate_without_images_uses_text_content(
-    mock_mistral: MagicMock, settings: AppSettings
+    mock_mistral: MagicMock, make_chat_client: ChatClientFactory, settings: AppSettings
 ) -> None:
     """generate() should use plain text content when no images are provided."""
-    mock_client = _mock_client_with_response(mock_mistral)
+    mock_client = make_chat_client(mock_mistral)
 
     client = MistralClient(settings)
     await client.generate("Hello")
 
-    _, kwargs = mock_client.chat.complete_async.call_args
+    (kwargs,) = mock_client.chat.complete_async.calls
     # Should select default model (no images)
     assert kwargs["model"] == "mistral-small-latest"
     # Last message should have plain string content
@@ -4,12 +4,12 @@ from __future__ import annotations
 
 import pytest
 
-from src.api.model_selector import AVAILABLE_MODELS, ModelSelector
+from src.api.model_selector import AVAILABLE_MODELS, ModelCharacteristics, ModelSelector
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def selector() -> ModelSelector:
-    """Create a ModelSelector instance."""
+    """Create one ModelSelector for the session; it holds no mutable state."""
     return ModelSelector()
 
 
@@ -32,17 +32,18 @@ def test_select_model_with_images(selector: ModelSelector) -> None:
     assert result == "pixtral-12b-latest"
 
 
-def test_select_model_code_python(selector: ModelSelector) -> None:
-    """Should select code model for Python-related queries."""
-    prompts = [
+@pytest.mark.parametrize(
+    "prompt",
+    [
         "Write a Python function to sort a list",
         "How to debug this code?",
         "Explain this algorithm in Python",
         "Напиши функцию на Python",
-    ]
-    for prompt in prompts:
-        result = selector.select_model(prompt)
-        assert result == "codestral-latest", f"Failed for prompt: {prompt}"
+    ],
+)
+def test_select_model_code_python(selector: ModelSelector, prompt: str) -> None:
+    """Should select code model for Python-related queries."""
+    assert selector.select_model(prompt) == "codestral-latest"
 
 
 def test_select_model_code_javascript(selector: ModelSelector) -> None:
@@ -59,42 +60,45 @@ def test_select_model_code_block(selector: ModelSelector) -> None:
     assert result == "codestral-latest"
 
 
-def test_select_model_complex_reasoning(selector: ModelSelector) -> None:
-    """Should select medium model for complex reasoning tasks."""
-    prompts = [
+@pytest.mark.parametrize(
+    "prompt",
+    [
         "Analyze step by step why this approach is better",
         "Compare and evaluate these three solutions",
         "Explain the reasoning behind this design pattern",
         "Проанализируй почему это работает",
-    ]
-    for prompt in prompts:
-        result = selector.select_model(prompt)
-        assert result == "mistral-medium-latest", f"Failed for prompt: {prompt}"
+    ],
+)
+def test_select_model_complex_reasoning(selector: ModelSelector, prompt: str) -> None:
+    """Should select medium model for complex reasoning tasks."""
+    assert selector.select_model(prompt) == "mistral-medium-latest"
 
 
-def test_select_model_long_content(selector: ModelSelector) -> None:
-    """Should select medium model for long-form content requests."""
-    prompts = [
+@pytest.mark.parametrize(
+    "prompt",
+    [
         "Write a detailed explanation of quantum computing",
         "Provide a comprehensive guide to machine learning",
         "Напиши подробную статью о нейронных сетях",
-    ]
-    for prompt in prompts:
-        result = selector.select_model(prompt)
-        assert result == "mistral-medium-latest"
+    ],
+)
+def test_select_model_long_content(selector: ModelSelector, prompt: str) -> None:
+    """Should select medium model for long-form content requests."""
+    assert selector.select_model(prompt) == "mistral-medium-latest"
 
 
-def test_select_model_simple_query(selector: ModelSelector) -> None:
-    """Should select small/fast model for simple queries."""
-    prompts = [
+@pytest.mark.parametrize(
+    "prompt",
+    [
         "What is the capital of France?",
         "Hello, how are you?",
         "Translate this to English",
         "Привет, как дела?",
-    ]
-    for prompt in prompts:
-        result = selector.select_model(prompt)
-        assert result == "mistral-small-latest", f"Failed for prompt: {prompt}"
+    ],
+)
+def test_select_model_simple_query(selector: ModelSelector, prompt: str) -> None:
+    """Should select small/fast model for simple queries."""
+    assert selector.select_model(prompt) == "mistral-small-latest"
 
 
 def test_select_model_long_prompt(selector: ModelSelector) -> None:
@@ -176,13 +180,19 @@ def test_get_model_info_nonexistent(selector: ModelSelector) -> None:
     assert info is None
 
 
-def test_available_models_structure() -> None:
-    """All available models should have valid characteristics."""
+def test_available_models_not_empty() -> None:
+    """At least one model should be available."""
     assert len(AVAILABLE_MODELS) > 0
-    for model_name, characteristics in AVAILABLE_MODELS.items():
-        assert characteristics.name == model_name
-        assert characteristics.max_context_length > 0
-        assert 1 <= characteristics.speed_tier <= 3
-        assert 1 <= characteristics.complexity_score <= 3
-        assert isinstance(characteristics.supports_code, bool)
-        assert isinstance(characteristics.supports_vision, bool)
+
+
+@pytest.mark.parametrize(("model_name", "characteristics"), AVAILABLE_MODELS.items())
+def test_available_models_structure(
+    model_name: str, characteristics: ModelCharacteristics
+) -> None:
+    """Every available model should have valid characteristics."""
+    assert characteristics.name == model_name
+    assert characteristics.max_context_length > 0
+    assert 1 <= characteristics.speed_tier <= 3
+    assert 1 <= characteristics.complexity_score <= 3
+    assert isinstance(characteristics.supports_code, bool)
+    assert isinstance(characteristics.supports_vision, bool)
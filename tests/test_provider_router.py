@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import Iterator
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import DEFAULT, MagicMock, patch
 
 import pytest
 
@@ -11,28 +15,69 @@ from src.api.provider_router import ProviderRouter
 from src.config.settings import AppSettings, GroqSettings, MistralSettings
 
 
+@lru_cache(maxsize=None)
 def _make_settings(groq_enabled: bool = False) -> AppSettings:
-    return AppSettings(
+    """Build settings once per mode, skipping validation; the router only reads them."""
+    return AppSettings.model_construct(
         mistral_api_key="fake-mistral-key",
         groq_api_key="fake-groq-key" if groq_enabled else "",
-        mistral=MistralSettings(model="mistral-small-latest"),
-        groq=GroqSettings(enabled=groq_enabled),
+        mistral=MistralSettings.model_construct(model="mistral-small-latest"),
+        groq=GroqSettings.model_construct(enabled=groq_enabled),
     )
 
 
+@pytest.fixture(scope="module", autouse=True)
+def _client_patches() -> Iterator[dict[str, MagicMock]]:
+    """Patch both provider client classes once for every test in the module."""
+    with patch.multiple(
+        "src.api.provider_router", MistralClient=DEFAULT, GroqClient=DEFAULT
+    ) as mocks:
+        yield mocks
+
+
+@pytest.fixture
+def mock_mistral_cls(_client_patches: dict[str, MagicMock]) -> MagicMock:
+    """Hand each test the shared MistralClient mock with its state cleared."""
+    mock_cls = _client_patches["MistralClient"]
+    mock_cls.reset_mock(return_value=True, side_effect=True)
+    return mock_cls
+
+
+@pytest.fixture
+def mock_groq_cls(_client_patches: dict[str, MagicMock]) -> MagicMock:
+    """Hand each test the shared GroqClient mock with its state cleared."""
+    mock_cls = _client_patches["GroqClient"]
+    mock_cls.reset_mock(return_value=True, side_effect=True)
+    return mock_cls
+
+
 _RESPONSE = GenerateResponse(
     content="ok", model="test-model", input_tokens=1, output_tokens=2
 )
 
 
+def _provider(result: GenerateResponse | Exception) -> SimpleNamespace:
+    """Build a stand-in provider client whose ``generate()`` returns or raises *result*.
+
+    Prompts of every call are recorded in ``.prompts``.
+    """
+    prompts: list[str] = []
+
+    async def generate(prompt: str, **kwargs: Any) -> GenerateResponse:
+        prompts.append(prompt)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return SimpleNamespace(generate=generate, prompts=prompts)
+
+
 # ------------------------------------------------------------------
 # Mistral-only mode (Groq disabled)
 # ------------------------------------------------------------------
 
 
-@patch("src.api.provider_router.GroqClient")
-@patch("src.api.provider_router.MistralClient")
-def test_mistral_only_mode(mock_mistral_cls: MagicMock, mock_groq_cls: MagicMock) -> None:
+def test_mistral_only_mode(mock_groq_cls: MagicMock) -> None:
     """When Groq is disabled, GroqClient should NOT be created."""
     settings = _make_settings(groq_enabled=False)
     router = ProviderRouter(settings)
@@ -40,22 +85,16 @@ def test_mistral_only_mode(mock_mistral_cls: MagicMock, mock_groq_cls: MagicMock
     mock_groq_cls.assert_not_called()
 
 
-@patch("src.api.provider_router.GroqClient")
-@patch("src.api.provider_router.MistralClient")
-@pytest.mark.asyncio
-async def test_mistral_only_generate(
-    mock_mistral_cls: MagicMock, mock_groq_cls: MagicMock
-) -> None:
+async def test_mistral_only_generate(mock_mistral_cls: MagicMock) -> None:
     """When Groq is disabled, generate() should always use Mistral."""
     settings = _make_settings(groq_enabled=False)
-    mock_instance = MagicMock()
-    mock_instance.generate = AsyncMock(return_value=_RESPONSE)
-    mock_mistral_cls.return_value = mock_instance
+    mistral_inst = _provider(_RESPONSE)
+    mock_mistral_cls.return_value = mistral_inst
     router = ProviderRouter(settings)
 
     result = await router.generate("hello")
     assert result.content == "ok"
-    mock_instance.generate.assert_awaited_once()
+    assert mistral_inst.prompts == ["hello"]
 
 
 # ------------------------------------------------------------------
@@ -63,11 +102,7 @@ async def test_mistral_only_generate(
 # ------------------------------------------------------------------
 
 
-@patch("src.api.provider_router.GroqClient")
-@patch("src.api.provider_router.MistralClient")
-def test_dual_mode_groq_created(
-    mock_mistral_cls: MagicMock, mock_groq_cls: MagicMock
-) -> None:
+def test_dual_mode_groq_created(mock_groq_cls: MagicMock) -> None:
     """When Groq is enabled with an API key, GroqClient should be created."""
     settings = _make_settings(groq_enabled=True)
     router = ProviderRouter(settings)
@@ -75,22 +110,15 @@ def test_dual_mode_groq_created(
     mock_groq_cls.assert_called_once()
 
 
-@patch("src.api.provider_router.GroqClient")
-@patch("src.api.provider_router.MistralClient")
-@pytest.mark.asyncio
 async def test_round_robin_alternation(
     mock_mistral_cls: MagicMock, mock_groq_cls: MagicMock
 ) -> None:
     """Requests should alternate between Mistral and Groq."""
     settings = _make_settings(groq_enabled=True)
-    mistral_inst = MagicMock()
-    groq_inst = MagicMock()
     mistral_resp = GenerateResponse(content="mistral", model="m", input_tokens=0, output_tokens=0)
     groq_resp = GenerateResponse(content="groq", model="g", input_tokens=0, output_tokens=0)
-    mistral_inst.generate = AsyncMock(return_value=mistral_resp)
-    groq_inst.generate = AsyncMock(return_value=groq_resp)
-    mock_mistral_cls.return_value = mistral_inst
-    mock_groq_cls.return_value = groq_inst
+    mock_mistral_cls.return_value = _provider(mistral_resp)
+    mock_groq_cls.return_value = _provider(groq_resp)
 
     router = ProviderRouter(settings)
 
@@ -107,21 +135,14 @@ async def test_round_robin_alternation(
 # ------------------------------------------------------------------
 
 
-@patch("src.api.provider_router.GroqClient")
-@patch("src.api.provider_router.MistralClient")
-@pytest.mark.asyncio
 async def test_fallback_on_primary_failure(
     mock_mistral_cls: MagicMock, mock_groq_cls: MagicMock
 ) -> None:
     """When the primary provider fails, the fallback should be used."""
     settings = _make_settings(groq_enabled=True)
-    mistral_inst = MagicMock()
-    groq_inst = MagicMock()
-    mistral_inst.generate = AsyncMock(side_effect=RuntimeError("rate limit"))
     groq_resp = GenerateResponse(content="groq-ok", model="g", input_tokens=0, output_tokens=0)
-    groq_inst.generate = AsyncMock(return_value=groq_resp)
-    mock_mistral_cls.return_value = mistral_inst
-    mock_groq_cls.return_value = groq_inst
+    mock_mistral_cls.return_value = _provider(RuntimeError("rate limit"))
+    mock_groq_cls.return_value = _provider(groq_resp)
 
     router = ProviderRouter(settings)
     # Force mistral first
@@ -131,20 +152,13 @@ async def test_fallback_on_primary_failure(
     assert result.content == "groq-ok"
 
 
-@patch("src.api.provider_router.GroqClient")
-@patch("src.api.provider_router.MistralClient")
-@pytest.mark.asyncio
 async def test_all_providers_fail_raises(
     mock_mistral_cls: MagicMock, mock_groq_cls: MagicMock
 ) -> None:
     """When all providers fail, the last exception should be raised."""
     settings = _make_settings(groq_enabled=True)
-    mistral_inst = MagicMock()
-    groq_inst = MagicMock()
-    mistral_inst.generate = AsyncMock(side_effect=RuntimeError("mistral down"))
-    groq_inst.generate = AsyncMock(side_effect=RuntimeError("groq down"))
-    mock_mistral_cls.return_value = mistral_inst
-    mock_groq_cls.return_value = groq_inst
+    mock_mistral_cls.return_value = _provider(RuntimeError("mistral down"))
+    mock_groq_cls.return_value = _provider(RuntimeError("groq down"))
 
     router = ProviderRouter(settings)
 
@@ -2,227 +2,306 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
 
 import pytest
-from telegram.error import RetryAfter
+from telegram.error import BadRequest, RetryAfter
+
+from src.bot.handlers.message_handler import (
+    _ChatCircuitBreakers,
+    _CircuitBreaker,
+    _safe_edit_message,
+    _safe_send_message,
+    _TokenBucket,
+)
+
+# Stands in for the Message returned by reply_text
+_SENT = object()
+
+_MD = "Markdown"
+_PLAIN = None
+
+
+def _retry() -> RetryAfter:
+    return RetryAfter(0)
+
+
+def _parse_error() -> BadRequest:
+    return BadRequest("Can't parse entities")
+
+
+# (helper, message method, side effect, expected result, parse modes awaited, sleeps)
+SAFE_MESSAGE_CASES = [
+    # Plain success on the first attempt
+    pytest.param(_safe_edit_message, "edit_text", [None], True, [_MD], [], id="edit_success"),
+    pytest.param(_safe_send_message, "reply_text", [_SENT], _SENT, [_MD], [], id="send_success"),
+    # RetryAfter once, then success: sleeps retry_after + 0.5 seconds
+    pytest.param(
+        _safe_edit_message, "edit_text", [_retry(), None], True, [_MD, _MD], [0.5],
+        id="edit_retry_after",
+    ),
+    pytest.param(
+        _safe_send_message, "reply_text", [_retry(), _SENT], _SENT, [_MD, _MD], [0.5],
+        id="send_retry_after",
+    ),
+    # RetryAfter on every attempt: gives up after max_retries, sleeping between attempts only
+    pytest.param(
+        _safe_edit_message, "edit_text", _retry(), False, [_MD] * 3, [0.5, 0.5],
+        id="edit_retry_after_max_retries",
+    ),
+    pytest.param(
+        _safe_send_message, "reply_text", _retry(), None, [_MD] * 3, [0.5, 0.5],
+        id="send_retry_after_max_retries",
+    ),
+    # "Message is not modified" is not a real error
+    pytest.param(
+        _safe_edit_message, "edit_text", BadRequest("Message is not modified"), True, [_MD], [],
+        id="edit_message_not_modified",
+    ),
+    # Markdown parse error falls back to plain text
+    pytest.param(
+        _safe_edit_message, "edit_text", [_parse_error(), None], True, [_MD, _PLAIN], [],
+        id="edit_parse_error",
+    ),
+    pytest.param(
+        _safe_send_message, "reply_text", [_parse_error(), _SENT], _SENT, [_MD, _PLAIN], [],
+        id="send_parse_error",
+    ),
+    # Parse error fallback hitting RetryAfter during the plain text retry
+    pytest.param(
+        _safe_edit_message, "edit_text", [_parse_error(), _retry(), None], True,
+        [_MD, _PLAIN, _PLAIN], [0.5],
+        id="edit_parse_error_then_retry_after",
+    ),
+    pytest.param(
+        _safe_send_message, "reply_text", [_parse_error(), _retry(), _SENT], _SENT,
+        [_MD, _PLAIN, _PLAIN], [0.5],
+        id="send_parse_error_then_retry_after",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("helper", "method_name", "side_effect", "expected", "parse_modes", "sleeps"),
+    SAFE_MESSAGE_CASES,
+)
+async def test_safe_message_helpers(
+    helper: Callable[..., Awaitable[object]],
+    method_name: str,
+    side_effect: Any,
+    expected: object,
+    parse_modes: list[str | None],
+    sleeps: list[float],
+) -> None:
+    """_safe_edit_message/_safe_send_message retry, fall back and give up as expected."""
+    method = AsyncMock(side_effect=side_effect)
+    message = SimpleNamespace(**{method_name: method})
+    sleep = AsyncMock()
+
+    result = await helper(
+        message, "test text", max_retries=3, sleep_fn=sleep, limiter=None, breakers=None
+    )
+
+    assert result is expected
+    assert [call.args for call in method.await_args_list] == [("test text",)] * len(parse_modes)
+    assert [call.kwargs["parse_mode"] for call in method.await_args_list] == parse_modes
+    assert [call.args[0] for call in sleep.await_args_list] == sleeps
+
+
+class _FakeClock:
+    """Monotonic clock that only moves when the code under test sleeps or the test advances it."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.parametrize(
+    ("burst", "spacing", "sleeps"),
+    [
+        # Rate is 8/s so every interval is exact in binary floating point
+        pytest.param(5, 0.0, [], id="within_burst"),
+        pytest.param(3, 0.0, [0.125, 0.125], id="beyond_burst"),
+        pytest.param(1, 0.125, [], id="spaced_at_rate"),
+        pytest.param(1, 0.0625, [0.0625] * 4, id="spaced_faster_than_rate"),
+    ],
+)
+async def test_token_bucket_spaces_calls(burst: int, spacing: float, sleeps: list[float]) -> None:
+    """Calls beyond the burst wait for their share of the backlog at 1/rate spacing."""
+    clock = _FakeClock()
+    bucket = _TokenBucket(rate=8.0, burst=burst, clock=clock)
+
+    for _ in range(5):
+        await bucket.acquire(clock.sleep)
+        clock.now += spacing
+
+    assert clock.sleeps == sleeps
+
+
+async def test_token_bucket_reset_refills_burst() -> None:
+    """reset() hands out a full burst again without waiting for the refill."""
+    clock = _FakeClock()
+    bucket = _TokenBucket(rate=8.0, burst=2, clock=clock)
+    for _ in range(3):
+        await bucket.acquire(clock.sleep)
+    assert clock.sleeps == [0.125]
+
+    bucket.reset()
+    for _ in range(2):
+        await bucket.acquire(clock.sleep)
+
+    assert clock.sleeps == [0.125]
+
+
+@pytest.mark.parametrize("throttled", [True, False], ids=["throttled", "unthrottled"])
+async def test_token_bucket_avoids_retry_after(throttled: bool) -> None:
+    """A server allowing 10 calls per second never answers RetryAfter to a throttled sender."""
+    clock = _FakeClock()
+    limiter = _TokenBucket(rate=5.0, burst=5, clock=clock) if throttled else None
+    accepted: list[float] = []
+    rejected = 0
+
+    async def reply_text(text: str, parse_mode: str | None = None) -> object:
+        nonlocal rejected
+        if sum(t > clock.now - 1.0 for t in accepted) >= 10:
+            rejected += 1
+            raise RetryAfter(1)
+        accepted.append(clock.now)
+        return _SENT
+
+    message = SimpleNamespace(reply_text=reply_text)
+    for _ in range(30):
+        await _safe_send_message(
+            message, "text", sleep_fn=clock.sleep, limiter=limiter, breakers=None
+        )
+
+    if throttled:
+        assert rejected == 0
+        assert len(accepted) == 30
+    else:
+        assert rejected > 0
+
+
+async def test_circuit_breaker_fails_fast_once_open() -> None:
+    """After 5 consecutive RetryAfters the 6th send returns None without calling Telegram."""
+    clock = _FakeClock()
+    breakers = _ChatCircuitBreakers(error_threshold=5, recovery_window=30.0, clock=clock)
+    reply_text = AsyncMock(side_effect=_retry())
+    message = SimpleNamespace(chat_id=1, reply_text=reply_text)
+
+    for _ in range(5):
+        result = await _safe_send_message(
+            message, "text", max_retries=1, sleep_fn=clock.sleep, limiter=None, breakers=breakers
+        )
+        assert result is None
+    assert breakers.for_chat(1).state == _CircuitBreaker.OPEN
+    assert reply_text.await_count == 5
+
+    result = await _safe_send_message(
+        message, "text", sleep_fn=clock.sleep, limiter=None, breakers=breakers
+    )
 
-from src.bot.handlers.message_handler import _safe_edit_message, _safe_send_message
-
-
-@pytest.mark.asyncio
-async def test_safe_edit_message_success() -> None:
-    """Test that _safe_edit_message successfully edits a message."""
-    message = MagicMock()
-    message.edit_text = AsyncMock()
-
-    result = await _safe_edit_message(message, "test text")
-
-    assert result is True
-    message.edit_text.assert_awaited_once_with("test text", parse_mode="Markdown")
-
-
-@pytest.mark.asyncio
-async def test_safe_edit_message_retry_after() -> None:
-    """Test that _safe_edit_message handles RetryAfter exception and retries."""
-    message = MagicMock()
-
-    # First call raises RetryAfter, second call succeeds
-    retry_error = RetryAfter(1)
-    message.edit_text = AsyncMock(side_effect=[retry_error, None])
-
-    with patch(
-        "src.bot.handlers.message_handler.asyncio.sleep", new_callable=AsyncMock
-    ) as mock_sleep:
-        result = await _safe_edit_message(message, "test text", max_retries=3)
-
-    assert result is True
-    assert message.edit_text.await_count == 2
-    # Should sleep for retry_after + 0.5 seconds
-    mock_sleep.assert_awaited_once_with(1.5)
-
-
-@pytest.mark.asyncio
-async def test_safe_edit_message_retry_after_max_retries() -> None:
-    """Test that _safe_edit_message fails after max retries."""
-    message = MagicMock()
-
-    # Always raises RetryAfter
-    retry_error = RetryAfter(1)
-    message.edit_text = AsyncMock(side_effect=retry_error)
-
-    with patch(
-        "src.bot.handlers.message_handler.asyncio.sleep", new_callable=AsyncMock
-    ) as mock_sleep:
-        result = await _safe_edit_message(message, "test text", max_retries=3)
-
-    assert result is False
-    assert message.edit_text.await_count == 3
-    # Should sleep twice (attempts 1 and 2, but not attempt 3)
-    assert mock_sleep.await_count == 2
-
-
-@pytest.mark.asyncio
-async def test_safe_send_message_success() -> None:
-    """Test that _safe_send_message successfully sends a message."""
-    message = MagicMock()
-    sent_message = MagicMock()
-    message.reply_text = AsyncMock(return_value=sent_message)
-
-    result = await _safe_send_message(message, "test text")
-
-    assert result == sent_message
-    message.reply_text.assert_awaited_once_with("test text", parse_mode="Markdown")
-
-
-@pytest.mark.asyncio
-async def test_safe_send_message_retry_after() -> None:
-    """Test that _safe_send_message handles RetryAfter exception and retries."""
-    message = MagicMock()
-    sent_message = MagicMock()
+    assert result is None
+    assert reply_text.await_count == 5
 
-    # First call raises RetryAfter, second call succeeds
-    retry_error = RetryAfter(1)
-    message.reply_text = AsyncMock(side_effect=[retry_error, sent_message])
 
-    with patch(
-        "src.bot.handlers.message_handler.asyncio.sleep", new_callable=AsyncMock
-    ) as mock_sleep:
-        result = await _safe_send_message(message, "test text", max_retries=3)
+async def test_circuit_breaker_is_scoped_per_chat() -> None:
+    """An open circuit in one chat leaves sends to other chats untouched."""
+    clock = _FakeClock()
+    breakers = _ChatCircuitBreakers(error_threshold=1, recovery_window=30.0, clock=clock)
+    breakers.for_chat(1).record_failure()
+    reply_text = AsyncMock(return_value=_SENT)
 
-    assert result == sent_message
-    assert message.reply_text.await_count == 2
-    # Should sleep for retry_after + 0.5 seconds
-    mock_sleep.assert_awaited_once_with(1.5)
+    blocked = await _safe_send_message(
+        SimpleNamespace(chat_id=1, reply_text=reply_text), "text", limiter=None, breakers=breakers
+    )
+    sent = await _safe_send_message(
+        SimpleNamespace(chat_id=2, reply_text=reply_text), "text", limiter=None, breakers=breakers
+    )
 
+    assert blocked is None
+    assert sent is _SENT
+    assert reply_text.await_count == 1
 
-@pytest.mark.asyncio
-async def test_safe_send_message_retry_after_max_retries() -> None:
-    """Test that _safe_send_message fails after max retries."""
-    message = MagicMock()
 
-    # Always raises RetryAfter
-    retry_error = RetryAfter(2)
-    message.reply_text = AsyncMock(side_effect=retry_error)
+async def test_circuit_breaker_counts_one_failure_per_call() -> None:
+    """A call that exhausts its retries on RetryAfter counts as a single failure."""
+    clock = _FakeClock()
+    breakers = _ChatCircuitBreakers(error_threshold=2, recovery_window=30.0, clock=clock)
+    message = SimpleNamespace(chat_id=1, reply_text=AsyncMock(side_effect=_retry()))
 
-    with patch(
-        "src.bot.handlers.message_handler.asyncio.sleep", new_callable=AsyncMock
-    ) as mock_sleep:
-        result = await _safe_send_message(message, "test text", max_retries=3)
+    result = await _safe_send_message(
+        message, "text", max_retries=3, sleep_fn=clock.sleep, limiter=None, breakers=breakers
+    )
 
     assert result is None
     assert message.reply_text.await_count == 3
-    # Should sleep twice (attempts 1 and 2, but not attempt 3)
-    assert mock_sleep.await_count == 2
-
-
-@pytest.mark.asyncio
-async def test_safe_edit_message_handles_message_not_modified() -> None:
-    """Test that _safe_edit_message handles 'message is not modified' error."""
-    from telegram.error import BadRequest
+    assert breakers.for_chat(1).state == _CircuitBreaker.CLOSED
 
-    message = MagicMock()
-    bad_request = BadRequest("Message is not modified")
-    message.edit_text = AsyncMock(side_effect=bad_request)
 
-    result = await _safe_edit_message(message, "test text")
+async def test_circuit_breaker_opening_skips_the_retry_sleep() -> None:
+    """The failure that opens the circuit ends the call without waiting out RetryAfter."""
+    clock = _FakeClock()
+    breakers = _ChatCircuitBreakers(error_threshold=1, recovery_window=30.0, clock=clock)
+    message = SimpleNamespace(chat_id=1, edit_text=AsyncMock(side_effect=_retry()))
 
-    # Should return True because message not modified is not a real error
-    assert result is True
-    message.edit_text.assert_awaited_once()
+    result = await _safe_edit_message(
+        message, "text", max_retries=3, sleep_fn=clock.sleep, limiter=None, breakers=breakers
+    )
 
-
-@pytest.mark.asyncio
-async def test_safe_edit_message_handles_parse_error() -> None:
-    """Test that _safe_edit_message handles markdown parse errors."""
-    from telegram.error import BadRequest
-
-    message = MagicMock()
-    parse_error = BadRequest("Can't parse entities")
-    # First call with Markdown fails, second call without parse_mode succeeds
-    message.edit_text = AsyncMock(side_effect=[parse_error, None])
-
-    result = await _safe_edit_message(message, "test text")
-
-    assert result is True
-    assert message.edit_text.await_count == 2
-    # First call with Markdown, second call without parse_mode
-    message.edit_text.assert_any_await("test text", parse_mode="Markdown")
-    message.edit_text.assert_any_await("test text", parse_mode=None)
-
-
-@pytest.mark.asyncio
-async def test_safe_send_message_handles_parse_error() -> None:
-    """Test that _safe_send_message handles markdown parse errors."""
-    from telegram.error import BadRequest
-
-    message = MagicMock()
-    sent_message = MagicMock()
-    parse_error = BadRequest("Can't parse entities")
-    # First call with Markdown fails, second call without parse_mode succeeds
-    message.reply_text = AsyncMock(side_effect=[parse_error, sent_message])
-
-    result = await _safe_send_message(message, "test text")
-
-    assert result == sent_message
-    assert message.reply_text.await_count == 2
-    # First call with Markdown, second call without parse_mode
-    message.reply_text.assert_any_await("test text", parse_mode="Markdown")
-    message.reply_text.assert_any_await("test text", parse_mode=None)
-
-
-@pytest.mark.asyncio
-async def test_safe_edit_message_parse_error_then_retry_after() -> None:
-    """Test parse error fallback encountering RetryAfter during plain text retry."""
-    from telegram.error import BadRequest
-
-    message = MagicMock()
-    parse_error = BadRequest("Can't parse entities")
-    retry_error = RetryAfter(1)
-
-    # First call with Markdown fails with parse error,
-    # second call without parse_mode fails with RetryAfter,
-    # third call succeeds
-    message.edit_text = AsyncMock(side_effect=[parse_error, retry_error, None])
-
-    with patch(
-        "src.bot.handlers.message_handler.asyncio.sleep", new_callable=AsyncMock
-    ) as mock_sleep:
-        result = await _safe_edit_message(message, "test text", max_retries=3)
-
-    assert result is True
-    assert message.edit_text.await_count == 3
-    # Should have slept once during RetryAfter handling
-    mock_sleep.assert_awaited_once_with(1.5)
-    # Verify the sequence: Markdown, plain text with retry
-    message.edit_text.assert_any_await("test text", parse_mode="Markdown")
-    message.edit_text.assert_any_await("test text", parse_mode=None)
-
-
-@pytest.mark.asyncio
-async def test_safe_send_message_parse_error_then_retry_after() -> None:
-    """Test parse error fallback encountering RetryAfter during plain text retry."""
-    from telegram.error import BadRequest
-
-    message = MagicMock()
-    sent_message = MagicMock()
-    parse_error = BadRequest("Can't parse entities")
-    retry_error = RetryAfter(1)
-
-    # First call with Markdown fails with parse error,
-    # second call without parse_mode fails with RetryAfter,
-    # third call succeeds
-    message.reply_text = AsyncMock(side_effect=[parse_error, retry_error, sent_message])
-
-    with patch(
-        "src.bot.handlers.message_handler.asyncio.sleep", new_callable=AsyncMock
-    ) as mock_sleep:
-        result = await _safe_send_message(message, "test text", max_retries=3)
-
-    assert result == sent_message
-    assert message.reply_text.await_count == 3
-    # Should have slept once during RetryAfter handling
-    mock_sleep.assert_awaited_once_with(1.5)
-    # Verify the sequence: Markdown, plain text with retry
-    message.reply_text.assert_any_await("test text", parse_mode="Markdown")
-    message.reply_text.assert_any_await("test text", parse_mode=None)
+    assert result is False
+    assert message.edit_text.await_count == 1
+    assert clock.sleeps == []
+
+
+async def test_chat_circuit_breakers_forget_closed_chats() -> None:
+    """A chat's breaker is dropped once a success closes it, so idle chats hold no state."""
+    breakers = _ChatCircuitBreakers(error_threshold=5, recovery_window=30.0)
+    breaker = breakers.for_chat(1)
+    breaker.record_failure()
+    assert breakers.for_chat(1) is breaker
+
+    message = SimpleNamespace(chat_id=1, reply_text=AsyncMock(return_value=_SENT))
+    await _safe_send_message(message, "text", limiter=None, breakers=breakers)
+
+    assert breakers.for_chat(1) is not breaker
+
+
+@pytest.mark.parametrize(
+    ("probe", "expected", "state"),
+    [
+        pytest.param(_SENT, _SENT, _CircuitBreaker.CLOSED, id="probe_succeeds"),
+        pytest.param(_retry(), None, _CircuitBreaker.OPEN, id="probe_fails"),
+    ],
+)
+async def test_circuit_breaker_probes_once_after_recovery_window(
+    probe: object, expected: object, state: str
+) -> None:
+    """Once the recovery window passes, a single probe decides whether the circuit closes."""
+    clock = _FakeClock()
+    breakers = _ChatCircuitBreakers(error_threshold=1, recovery_window=30.0, clock=clock)
+    breaker = breakers.for_chat(1)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now += 30.0
+    reply_text = AsyncMock(side_effect=[probe])
+    message = SimpleNamespace(chat_id=1, reply_text=reply_text)
+
+    result = await _safe_send_message(
+        message, "text", sleep_fn=clock.sleep, limiter=None, breakers=breakers
+    )
+
+    assert result is expected
+    assert reply_text.await_count == 1
+    assert breaker.state == state
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import Callable, Iterator
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -10,12 +13,26 @@ from src.api.reaction_analyzer import ReactionAnalyzer
 from src.config.settings import AppSettings, ReactionSettings
 
 
+@pytest.fixture(scope="module", autouse=True)
+def _mistral_patch() -> Iterator[MagicMock]:
+    """Patch the Mistral SDK class once for every test in the module."""
+    with patch("src.api.reaction_analyzer.Mistral") as mock_mistral:
+        yield mock_mistral
+
+
 @pytest.fixture
-def settings() -> AppSettings:
-    """Create test settings with reactions enabled."""
-    return AppSettings(
+def mock_mistral(_mistral_patch: MagicMock) -> MagicMock:
+    """Hand each test the shared Mistral mock with its calls and return value cleared."""
+    _mistral_patch.reset_mock(return_value=True, side_effect=True)
+    return _mistral_patch
+
+
+@pytest.fixture(scope="session")
+def _enabled_settings() -> AppSettings:
+    """Build the reactions-enabled settings once, skipping validation and env loading."""
+    return AppSettings.model_construct(
         mistral_api_key="fake-key",
-        reactions=ReactionSettings(
+        reactions=ReactionSettings.model_construct(
             enabled=True,
             model="mistral-small-latest",
             probability=1.0,  # Always analyze for testing
@@ -29,12 +46,12 @@ def settings() -> AppSettings:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def disabled_settings() -> AppSettings:
     """Create test settings with reactions disabled."""
-    return AppSettings(
+    return AppSettings.model_construct(
         mistral_api_key="fake-key",
-        reactions=ReactionSettings(
+        reactions=ReactionSettings.model_construct(
             enabled=False,
             probability=1.0,
             min_words=3,
@@ -42,7 +59,18 @@ def disabled_settings() -> AppSettings:
     )
 
 
-@patch("src.api.reaction_analyzer.Mistral")
+@pytest.fixture
+def settings(_enabled_settings: AppSettings) -> AppSettings:
+    """Return a fresh copy of the reactions-enabled settings; some tests mutate it."""
+    return _enabled_settings.model_copy(deep=True)
+
+
+@pytest.fixture
+def analyzer(settings: AppSettings) -> ReactionAnalyzer:
+    """Build an analyzer over ``settings``; it reads them live, so tests may mutate them."""
+    return ReactionAnalyzer(settings)
+
+
 def test_analyzer_init(mock_mistral: MagicMock, settings: AppSettings) -> None:
     """ReactionAnalyzer should initialize with Mistral client."""
     ReactionAnalyzer(settings)
@@ -55,31 +83,31 @@ def test_should_analyze_disabled(disabled_settings: AppSettings) -> None:
     assert not analyzer.should_analyze("This is a test message")
 
 
-def test_should_analyze_runtime_disabled(settings: AppSettings) -> None:
+def test_should_analyze_runtime_disabled(
+    analyzer: ReactionAnalyzer, settings: AppSettings
+) -> None:
     """should_analyze() returns False when reactions_enabled is False at runtime."""
     settings.access.reactions_enabled = False
-    analyzer = ReactionAnalyzer(settings)
     assert not analyzer.should_analyze("This is a test message")
 
 
-def test_should_analyze_too_few_words(settings: AppSettings) -> None:
+def test_should_analyze_too_few_words(analyzer: ReactionAnalyzer) -> None:
     """should_analyze() returns False when message has too few words."""
-    analyzer = ReactionAnalyzer(settings)
     assert not analyzer.should_analyze("Hi")  # 1 word < 3
 
 
-def test_should_analyze_enough_words(settings: AppSettings) -> None:
+def test_should_analyze_enough_words(analyzer: ReactionAnalyzer) -> None:
     """should_analyze() returns True when message meets all criteria."""
-    analyzer = ReactionAnalyzer(settings)
     # Settings have probability=1.0, so this should always return True
     assert analyzer.should_analyze("This is a test message")
 
 
 @patch("src.api.reaction_analyzer.random.random")
-def test_should_analyze_probability(mock_random: MagicMock, settings: AppSettings) -> None:
+def test_should_analyze_probability(
+    mock_random: MagicMock, analyzer: ReactionAnalyzer, settings: AppSettings
+) -> None:
     """should_analyze() respects probability threshold."""
     settings.reactions.probability = 0.3
-    analyzer = ReactionAnalyzer(settings)
 
     # Mock random to return value above threshold (>= 0.3)
     mock_random.return_value = 0.5  # >= 0.3, should NOT analyze
@@ -92,11 +120,9 @@ def test_should_analyze_probability(mock_random: MagicMock, settings: AppSetting
 
 @patch("src.api.reaction_analyzer.random.random")
 def test_should_analyze_probability_edge_cases(
-    mock_random: MagicMock, settings: AppSettings
+    mock_random: MagicMock, analyzer: ReactionAnalyzer, settings: AppSettings
 ) -> None:
     """should_analyze() handles edge cases: 0.0 = never, 1.0 = always."""
-    analyzer = ReactionAnalyzer(settings)
-
     # Test probability = 0.0 should never analyze
     settings.reactions.probability = 0.0
     mock_random.return_value = 0.0  # Even at 0.0, should not analyze
@@ -110,40 +136,25 @@ def test_should_analyze_probability_edge_cases(
     assert analyzer.should_analyze("This is a test message")
 
 
-@patch("src.api.reaction_analyzer.Mistral")
-@pytest.mark.asyncio
-async def test_analyze_mood_success(mock_mistral: MagicMock, settings: AppSettings) -> None:
+async def test_analyze_mood_success(
+    mock_mistral: MagicMock, make_chat_client: Callable[..., SimpleNamespace], settings: AppSettings
+) -> None:
     """analyze_mood() should return mood string from API response."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_choice = MagicMock()
-    mock_message = MagicMock()
-
-    # Setup mock response chain
-    mock_message.content = "positive"
-    mock_choice.message = mock_message
-    mock_response.choices = [mock_choice]
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_client.aclose = AsyncMock()
-    mock_mistral.return_value = mock_client
+    mock_client = make_chat_client(mock_mistral, "positive")
 
     analyzer = ReactionAnalyzer(settings)
     mood = await analyzer.analyze_mood("This is great!")
 
     assert mood == "positive"
-    mock_client.chat.complete_async.assert_called_once()
+    assert len(mock_client.chat.complete_async.calls) == 1
 
 
-@patch("src.api.reaction_analyzer.Mistral")
-@pytest.mark.asyncio
 async def test_analyze_mood_no_choices(mock_mistral: MagicMock, settings: AppSettings) -> None:
     """analyze_mood() should return None when API returns no choices."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_response.choices = None
-    mock_client.chat.complete_async = AsyncMock(return_value=mock_response)
-    mock_client.aclose = AsyncMock()
-    mock_mistral.return_value = mock_client
+    async def _no_choices(**kwargs: Any) -> SimpleNamespace:
+        return SimpleNamespace(choices=None)
+
+    mock_mistral.return_value = SimpleNamespace(chat=SimpleNamespace(complete_async=_no_choices))
 
     analyzer = ReactionAnalyzer(settings)
     mood = await analyzer.analyze_mood("Test message")
@@ -151,13 +162,12 @@ async def test_analyze_mood_no_choices(mock_mistral: MagicMock, settings: AppSet
     assert mood is None
 
 
-@patch("src.api.reaction_analyzer.Mistral")
-@pytest.mark.asyncio
 async def test_analyze_mood_exception(mock_mistral: MagicMock, settings: AppSettings) -> None:
     """analyze_mood() should return None on API exception."""
-    mock_client = MagicMock()
-    mock_client.chat.complete_async = AsyncMock(side_effect=Exception("API Error"))
-    mock_mistral.return_value = mock_client
+    async def _raise(**kwargs: Any) -> None:
+        raise Exception("API Error")
+
+    mock_mistral.return_value = SimpleNamespace(chat=SimpleNamespace(complete_async=_raise))
 
     analyzer = ReactionAnalyzer(settings)
     mood = await analyzer.analyze_mood("Test message")
@@ -165,22 +175,19 @@ async def test_analyze_mood_exception(mock_mistral: MagicMock, settings: AppSett
     assert mood is None
 
 
-def test_get_reaction_emoji_known_mood(settings: AppSettings) -> None:
+def test_get_reaction_emoji_known_mood(analyzer: ReactionAnalyzer) -> None:
     """get_reaction_emoji() should return emoji for known mood."""
-    analyzer = ReactionAnalyzer(settings)
     assert analyzer.get_reaction_emoji("positive") == "👍"
     assert analyzer.get_reaction_emoji("negative") == "👎"
     assert analyzer.get_reaction_emoji("funny") == "😄"
 
 
-def test_get_reaction_emoji_unknown_mood(settings: AppSettings) -> None:
+def test_get_reaction_emoji_unknown_mood(analyzer: ReactionAnalyzer) -> None:
     """get_reaction_emoji() should return None for unknown mood."""
-    analyzer = ReactionAnalyzer(settings)
     assert analyzer.get_reaction_emoji("unknown") is None
 
 
-def test_get_reaction_emoji_case_insensitive(settings: AppSettings) -> None:
+def test_get_reaction_emoji_case_insensitive(analyzer: ReactionAnalyzer) -> None:
     """get_reaction_emoji() should be case insensitive."""
-    analyzer = ReactionAnalyzer(settings)
     assert analyzer.get_reaction_emoji("POSITIVE") == "👍"
     assert analyzer.get_reaction_emoji("Positive") == "👍"
@@ -0,0 +1,30 @@
+"""Tests for splitting long replies into Telegram-sized chunks."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.bot.handlers.message_handler import _split_text
+
+
+@pytest.mark.parametrize(
+    ("text", "max_length", "expected"),
+    [
+        ("hello", 100, ["hello"]),
+        ("abcdef", 2, ["ab", "cd", "ef"]),
+        ("abcde", 2, ["ab", "cd", "e"]),
+        ("", 10, [""]),
+        ("a" * 4096, 1024, ["a" * 1024] * 4),
+    ],
+)
+def test_split_text(text: str, max_length: int, expected: list[str]) -> None:
+    assert _split_text(text, max_length) == expected
+
+
+def test_split_text_telegram_limit() -> None:
+    """A long reply splits into 4096-char chunks that rejoin to the original."""
+    text = "x" * 100_000
+    chunks = _split_text(text, 4096)
+    assert len(chunks) == 25
+    assert all(len(chunk) <= 4096 for chunk in chunks)
+    assert "".join(chunks) == text
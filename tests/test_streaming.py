@@ -2,299 +2,262 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from src.api.mistral_client import MistralClient
-from src.bot.handlers.message_handler import MessageHandler
+from src.bot.filters.access_filter import AccessFilter
+from src.bot.handlers.message_handler import (
+    TELEGRAM_BREAKER_THRESHOLD,
+    MessageHandler,
+    _format_source_urls,
+    _telegram_breakers,
+    _truncate_safely,
+)
 from src.config.settings import AppSettings
 
 
-@pytest.fixture
-def settings() -> AppSettings:
-    """Create test settings with streaming enabled."""
-    s = AppSettings(
-        mistral_api_key="test-key",
-        telegram_bot_token="test-token",
-    )
-    s.bot.enable_streaming = True
-    s.bot.streaming_threshold = 100
-    s.bot.streaming_update_interval = 1.0
-    s.access.allowed_user_ids = [1]
-    return s
+# Minimal stand-ins for the SDK's streamed CompletionEvent payload
+@dataclass(frozen=True, slots=True)
+class _Delta:
+    content: str | None
 
 
-@pytest.fixture
-def settings_no_streaming() -> AppSettings:
-    """Create test settings with streaming disabled."""
-    s = AppSettings(
-        mistral_api_key="test-key",
-        telegram_bot_token="test-token",
-    )
-    s.bot.enable_streaming = False
-    s.access.allowed_user_ids = [1]
-    return s
+@dataclass(frozen=True, slots=True)
+class _Choice:
+    delta: _Delta
 
 
-def test_streaming_config_defaults() -> None:
-    """Test that streaming configuration has sensible defaults."""
-    settings = AppSettings(
-        mistral_api_key="test-key",
-        telegram_bot_token="test-token",
-    )
-    assert settings.bot.enable_streaming is True
-    assert settings.bot.streaming_threshold == 100
-    assert settings.bot.streaming_update_interval == 1.0
+@dataclass(frozen=True, slots=True)
+class _Data:
+    choices: list[_Choice]
+    usage: Any = None
 
 
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_stream_basic(mock_mistral: MagicMock, settings: AppSettings) -> None:
-    """Test basic streaming functionality."""
-    # Mock streaming response
-    mock_client = MagicMock()
-
-    # Create mock stream chunks
-    async def mock_stream():
-        # Chunk 1: partial content
-        chunk1 = MagicMock()
-        chunk1.data = MagicMock()
-        delta1 = MagicMock()
-        delta1.content = "Hello"
-        choice1 = MagicMock()
-        choice1.delta = delta1
-        chunk1.data.choices = [choice1]
-        chunk1.data.usage = None
-        yield chunk1
-
-        # Chunk 2: more content
-        chunk2 = MagicMock()
-        chunk2.data = MagicMock()
-        delta2 = MagicMock()
-        delta2.content = " world"
-        choice2 = MagicMock()
-        choice2.delta = delta2
-        chunk2.data.choices = [choice2]
-        chunk2.data.usage = None
-        yield chunk2
-
-        # Chunk 3: final with usage
-        chunk3 = MagicMock()
-        chunk3.data = MagicMock()
-        delta3 = MagicMock()
-        delta3.content = "!"
-        choice3 = MagicMock()
-        choice3.delta = delta3
-        chunk3.data.choices = [choice3]
-        usage = MagicMock()
-        usage.prompt_tokens = 10
-        usage.completion_tokens = 5
-        chunk3.data.usage = usage
-        yield chunk3
-
-    mock_client.chat.stream_async = AsyncMock(return_value=mock_stream())
-    mock_mistral.return_value = mock_client
-
-    client = MistralClient(settings)
-
-    accumulated = []
-    async for chunk_content, full_content, is_final, source_urls in client.generate_stream("test"):
-        accumulated.append((chunk_content, full_content, is_final, source_urls))
+@dataclass(frozen=True, slots=True)
+class _Chunk:
+    data: _Data
 
-    # Verify we got the expected chunks
-    assert len(accumulated) == 4  # 3 content chunks + 1 final
-    assert accumulated[0] == ("Hello", "Hello", False, [])
-    assert accumulated[1] == (" world", "Hello world", False, [])
-    assert accumulated[2] == ("!", "Hello world!", False, [])
-    assert accumulated[3][2] is True  # Final chunk
-    assert accumulated[3][1] == "Hello world!"  # Full content
 
+def _chunk(content: str | None, usage: Any = None) -> _Chunk:
+    """Build a single streamed chunk carrying *content* as its delta."""
+    return _Chunk(data=_Data(choices=[_Choice(_Delta(content))], usage=usage))
 
-@patch("src.api.mistral_client.Mistral")
-@pytest.mark.asyncio
-async def test_generate_stream_with_empty_chunks(
-    mock_mistral: MagicMock, settings: AppSettings
-) -> None:
-    """Test streaming handles empty chunks gracefully."""
-    mock_client = MagicMock()
-
-    async def mock_stream():
-        # Chunk with no content
-        chunk1 = MagicMock()
-        chunk1.data = MagicMock()
-        delta1 = MagicMock()
-        delta1.content = None
-        choice1 = MagicMock()
-        choice1.delta = delta1
-        chunk1.data.choices = [choice1]
-        chunk1.data.usage = None
-        yield chunk1
-
-        # Chunk with actual content
-        chunk2 = MagicMock()
-        chunk2.data = MagicMock()
-        delta2 = MagicMock()
-        delta2.content = "Content"
-        choice2 = MagicMock()
-        choice2.delta = delta2
-        chunk2.data.choices = [choice2]
-        chunk2.data.usage = None
-        yield chunk2
-
-    mock_client.chat.stream_async = AsyncMock(return_value=mock_stream())
-    mock_mistral.return_value = mock_client
-
-    client = MistralClient(settings)
-
-    accumulated = []
-    async for chunk_content, full_content, is_final, source_urls in client.generate_stream("test"):
-        if chunk_content or is_final:  # Only collect non-empty or final chunks
-            accumulated.append((chunk_content, full_content, is_final))
 
-    # Should have content chunk and final chunk
-    assert len(accumulated) >= 1
-    assert "Content" in accumulated[-1][1]
+class _ChunkStream:
+    """Async iterator over a fixed sequence of chunks, without an async generator frame."""
 
+    __slots__ = ("_chunks",)
 
-@pytest.mark.asyncio
-async def test_message_handler_uses_streaming_config() -> None:
-    """Test MessageHandler respects streaming configuration."""
-    from src.api.mistral_client import GenerateResponse
-    from src.bot.filters.access_filter import AccessFilter
+    def __init__(self, chunks: Iterable[_Chunk]) -> None:
+        self._chunks = iter(chunks)
 
-    # Test with streaming enabled
-    settings_streaming = AppSettings(
-        mistral_api_key="test-key",
-        telegram_bot_token="test-token",
-    )
-    settings_streaming.bot.enable_streaming = True
-    settings_streaming.access.allowed_user_ids = [1]
+    def __aiter__(self) -> _ChunkStream:
+        return self
 
-    mistral_streaming = MagicMock()
-    async def mock_stream(prompt, user_id=None):
-        yield ("Test", "Test", True, [])
-    mistral_streaming.generate_stream = mock_stream
-    mistral_streaming._memory = MagicMock()
-    mistral_streaming._memory.add_message = MagicMock()
+    async def __anext__(self) -> _Chunk:
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration from None
 
-    af = AccessFilter(settings_streaming)
-    handler_streaming = MessageHandler(settings_streaming, mistral_streaming, af)
 
-    # Verify streaming is enabled
-    assert handler_streaming._settings.bot.enable_streaming is True
+def _stream_async(chunks: Iterable[_Chunk]) -> Callable[..., Awaitable[_ChunkStream]]:
+    """Stand in for ``chat.stream_async``: a coroutine function resolving to *chunks*."""
 
-    # Test with streaming disabled
-    settings_no_streaming = AppSettings(
-        mistral_api_key="test-key",
-        telegram_bot_token="test-token",
-    )
-    settings_no_streaming.bot.enable_streaming = False
-    settings_no_streaming.access.allowed_user_ids = [1]
-
-    mistral_no_streaming = MagicMock()
-    mistral_no_streaming.generate = AsyncMock(
-        return_value=GenerateResponse(
-            content="Response",
-            model="mistral-small-latest",
-            input_tokens=5,
-            output_tokens=10,
-        )
-    )
-    mistral_no_streaming._memory = MagicMock()
-    mistral_no_streaming._memory.add_message = MagicMock()
+    async def _stream(**kwargs: Any) -> _ChunkStream:
+        return _ChunkStream(chunks)
+
+    return _stream
 
-    handler_no_streaming = MessageHandler(settings_no_streaming, mistral_no_streaming, af)
 
-    # Verify streaming is disabled
-    assert handler_no_streaming._settings.bot.enable_streaming is False
+# The payloads never change, so build them once; _ChunkStream only reads them
+_BASIC_CHUNKS = (
+    _chunk("Hello"),
+    _chunk(" world"),
+    # Final chunk carries usage
+    _chunk("!", SimpleNamespace(prompt_tokens=10, completion_tokens=5)),
+)
+# Chunk with no content, then one with actual content
+_EMPTY_FIRST_CHUNKS = (_chunk(None), _chunk("Content"))
 
 
-@pytest.mark.asyncio
-async def test_message_handler_streaming_disabled() -> None:
-    """Test MessageHandler respects streaming disabled configuration."""
-    from src.api.mistral_client import GenerateResponse
-    from src.bot.filters.access_filter import AccessFilter
+@pytest.fixture(scope="module", autouse=True)
+def _mistral_patch() -> Iterator[MagicMock]:
+    """Patch the Mistral SDK class once for every test in the module."""
+    with patch("src.api.mistral_client.Mistral") as mock_mistral:
+        yield mock_mistral
 
-    settings = AppSettings(
+
+@pytest.fixture
+def mock_mistral(_mistral_patch: MagicMock) -> MagicMock:
+    """Hand each test the shared Mistral mock with its calls and return value cleared."""
+    _mistral_patch.reset_mock(return_value=True, side_effect=True)
+    return _mistral_patch
+
+
+@pytest.fixture(scope="session")
+def _base_settings() -> AppSettings:
+    """Build the settings once per session, skipping validation and env loading.
+
+    Tests derive per-test copies from it; nested sections still come from
+    their default factories, so the defaults match a validated instance.
+    """
+    return AppSettings.model_construct(
         mistral_api_key="test-key",
         telegram_bot_token="test-token",
     )
-    settings.bot.enable_streaming = False
-    settings.access.allowed_user_ids = [1]
 
-    mistral = MagicMock()
-    mistral.generate = AsyncMock(
-        return_value=GenerateResponse(
-            content="Non-streaming response",
-            model="mistral-small-latest",
-            input_tokens=5,
-            output_tokens=10,
-        )
+
+def _derive(base: AppSettings, *, enable_streaming: bool, **bot_overrides: Any) -> AppSettings:
+    """Copy *base* with the given bot overrides and user 1 allowed."""
+    return base.model_copy(
+        update={
+            "bot": base.bot.model_copy(
+                update={"enable_streaming": enable_streaming, **bot_overrides}
+            ),
+            "access": base.access.model_copy(update={"allowed_user_ids": [1]}),
+        }
     )
-    mistral._memory = MagicMock()
-    mistral._memory.add_message = MagicMock()
 
-    af = AccessFilter(settings)
-    handler = MessageHandler(settings, mistral, af)
 
-    # Verify streaming is disabled
-    assert handler._settings.bot.enable_streaming is False
+@pytest.fixture
+def settings(_base_settings: AppSettings) -> AppSettings:
+    """Create test settings with streaming enabled."""
+    return _derive(
+        _base_settings,
+        enable_streaming=True,
+        streaming_threshold=100,
+        streaming_update_interval=1.0,
+    )
 
 
-def test_truncate_safely_basic() -> None:
-    """Test _truncate_safely function with basic text."""
-    from src.bot.handlers.message_handler import _truncate_safely
+@pytest.fixture
+def mistral_client(mock_mistral: MagicMock, settings: AppSettings) -> MistralClient:
+    """Build a client whose SDK instance is ``mock_mistral.return_value``."""
+    return MistralClient(settings)
 
-    text = "This is a simple test"
-    indicator = "..."
-    max_len = 30
 
-    result = _truncate_safely(text, max_len, indicator)
-    assert len(result) <= max_len
-    assert result.endswith(indicator)
+def _recorder(value: Any = None) -> Callable[..., Awaitable[Any]]:
+    """Return a coroutine function resolving to *value* that records its calls in ``.calls``."""
+    calls: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
 
+    async def _record(*args: Any, **kwargs: Any) -> Any:
+        calls.append((args, kwargs))
+        return value
 
-def test_truncate_safely_with_markdown() -> None:
-    """Test _truncate_safely closes markdown formatting."""
-    from src.bot.handlers.message_handler import _truncate_safely
+    _record.calls = calls  # type: ignore[attr-defined]
+    return _record
 
-    # Text with unclosed asterisks
-    text = "This is *bold text that will be truncated"
-    indicator = "..."
-    max_len = 20
 
-    result = _truncate_safely(text, max_len, indicator)
-    # Should close the asterisk
-    assert result.count('*') % 2 == 0
+def _fake_message() -> tuple[SimpleNamespace, SimpleNamespace]:
+    """Build an incoming message whose reply_text returns a status message, and that status."""
+    sent_status = SimpleNamespace(chat_id=1, edit_text=_recorder())
+    return SimpleNamespace(chat_id=1, reply_text=_recorder(sent_status)), sent_status
 
 
-def test_truncate_safely_with_backticks() -> None:
-    """Test _truncate_safely closes code blocks."""
-    from src.bot.handlers.message_handler import _truncate_safely
+HandlerFactory = Callable[[AppSettings, Any], MessageHandler]
 
-    # Text with unclosed backticks
-    text = "This is `code that will be truncated"
-    indicator = "..."
-    max_len = 20
 
-    result = _truncate_safely(text, max_len, indicator)
-    # Should close the backtick
-    assert result.count('`') % 2 == 0
+@pytest.fixture(scope="session")
+def make_handler() -> HandlerFactory:
+    """Return a factory wiring a MessageHandler to an AccessFilter over the same settings."""
 
+    def _make(settings: AppSettings, mistral: Any) -> MessageHandler:
+        return MessageHandler(settings, mistral, AccessFilter(settings))
 
-@pytest.mark.asyncio
-async def test_streaming_sends_status_message() -> None:
-    """Test that streaming handler sends an initial status message."""
-    from src.bot.filters.access_filter import AccessFilter
+    return _make
+
+
+def test_streaming_config_defaults(_base_settings: AppSettings) -> None:
+    """Test that streaming configuration has sensible defaults."""
+    settings = _base_settings
+    assert settings.bot.enable_streaming is True
+    assert settings.bot.streaming_threshold == 100
+    assert settings.bot.streaming_update_interval == 1.0
 
-    settings = AppSettings(
-        mistral_api_key="test-key",
-        telegram_bot_token="test-token",
-    )
-    settings.bot.enable_streaming = True
-    settings.access.allowed_user_ids = [1]
 
+async def test_generate_stream_basic(
+    mock_mistral: MagicMock, mistral_client: MistralClient
+) -> None:
+    """Test basic streaming functionality."""
+    mock_mistral.return_value.chat.stream_async = _stream_async(_BASIC_CHUNKS)
+
+    accumulated = [row async for row in mistral_client.generate_stream("test")]
+
+    # Verify we got the expected chunks
+    assert len(accumulated) == 4  # 3 content chunks + 1 final
+    assert accumulated[0] == ("Hello", "Hello", False, [])
+    assert accumulated[1] == (" world", "Hello world", False, [])
+    assert accumulated[2] == ("!", "Hello world!", False, [])
+    assert accumulated[3][2] is True  # Final chunk
+    assert accumulated[3][1] == "Hello world!"  # Full content
+
+
+async def test_generate_stream_with_empty_chunks(
+    mock_mistral: MagicMock, mistral_client: MistralClient
+) -> None:
+    """Test streaming handles empty chunks gracefully."""
+    mock_mistral.return_value.chat.stream_async = _stream_async(_EMPTY_FIRST_CHUNKS)
+
+    # Only collect non-empty or final chunks
+    accumulated = [
+        (chunk_content, full_content, is_final)
+        async for chunk_content, full_content, is_final, _ in mistral_client.generate_stream("test")
+        if chunk_content or is_final
+    ]
+
+    # Should have content chunk and final chunk
+    assert len(accumulated) >= 1
+    assert "Content" in accumulated[-1][1]
+
+
+@pytest.mark.parametrize("enable", [True, False], ids=["streaming", "no_streaming"])
+def test_message_handler_respects_streaming_flag(
+    enable: bool, _base_settings: AppSettings, make_handler: HandlerFactory
+) -> None:
+    """MessageHandler keeps the configured enable_streaming flag."""
+    settings = _derive(_base_settings, enable_streaming=enable)
+    mistral = MagicMock()
+
+    handler = make_handler(settings, mistral)
+
+    assert handler._settings.bot.enable_streaming is enable
+
+
+@pytest.mark.parametrize(
+    ("text", "max_len", "check"),
+    [
+        pytest.param(
+            "This is a simple test", 30, lambda r: len(r) <= 30 and r.endswith("..."),
+            id="basic",
+        ),
+        # Should close the asterisk
+        pytest.param(
+            "This is *bold text that will be truncated", 20, lambda r: r.count("*") % 2 == 0,
+            id="markdown",
+        ),
+        # Should close the backtick
+        pytest.param(
+            "This is `code that will be truncated", 20, lambda r: r.count("`") % 2 == 0,
+            id="backticks",
+        ),
+    ],
+)
+def test_truncate_safely(text: str, max_len: int, check: Callable[[str], bool]) -> None:
+    """_truncate_safely appends the indicator and closes any open markdown formatting."""
+    assert check(_truncate_safely(text, max_len, "..."))
+
+
+async def test_streaming_sends_status_message(
+    settings: AppSettings, make_handler: HandlerFactory
+) -> None:
+    """Test that streaming handler sends an initial status message."""
     mistral = MagicMock()
 
     async def mock_stream(prompt, user_id=None):
@@ -307,35 +270,22 @@ async def test_streaming_sends_status_message() -> None:
     mistral._web_search = None
     mistral._should_use_web_search = MagicMock(return_value=False)
 
-    af = AccessFilter(settings)
-    handler = MessageHandler(settings, mistral, af)
+    handler = make_handler(settings, mistral)
 
-    # Create mock message
-    message = MagicMock()
-    sent_status = AsyncMock()
-    sent_status.edit_text = AsyncMock()
-    message.reply_text = AsyncMock(return_value=sent_status)
+    message, _ = _fake_message()
 
     await handler._handle_streaming_response(message, "test", 1, "[You]: test")
 
     # Verify that reply_text was called first with the status message
-    first_call_args = message.reply_text.call_args_list[0]
-    assert first_call_args[0][0] == settings.status_messages.thinking
-    assert first_call_args[1].get("parse_mode") is None
+    first_args, first_kwargs = message.reply_text.calls[0]
+    assert first_args[0] == settings.status_messages.thinking
+    assert first_kwargs.get("parse_mode") is None
 
 
-@pytest.mark.asyncio
-async def test_streaming_sends_search_status_for_web_search() -> None:
+async def test_streaming_sends_search_status_for_web_search(
+    settings: AppSettings, make_handler: HandlerFactory
+) -> None:
     """Test that streaming shows search status when web search is triggered."""
-    from src.bot.filters.access_filter import AccessFilter
-
-    settings = AppSettings(
-        mistral_api_key="test-key",
-        telegram_bot_token="test-token",
-    )
-    settings.bot.enable_streaming = True
-    settings.access.allowed_user_ids = [1]
-
     mistral = MagicMock()
 
     async def mock_stream(prompt, user_id=None):
@@ -349,19 +299,15 @@ async def test_streaming_sends_search_status_for_web_search() -> None:
     mistral._web_search = MagicMock()
     mistral._should_use_web_search = MagicMock(return_value=True)
 
-    af = AccessFilter(settings)
-    handler = MessageHandler(settings, mistral, af)
+    handler = make_handler(settings, mistral)
 
-    message = MagicMock()
-    sent_status = AsyncMock()
-    sent_status.edit_text = AsyncMock()
-    message.reply_text = AsyncMock(return_value=sent_status)
+    message, _ = _fake_message()
 
     await handler._handle_streaming_response(message, "новости сегодня", 1, "[You]: новости")
 
     # Verify that reply_text was called first with the search status message
-    first_call_args = message.reply_text.call_args_list[0]
-    assert first_call_args[0][0] == settings.status_messages.searching
+    first_args, _ = message.reply_text.calls[0]
+    assert first_args[0] == settings.status_messages.searching
 
 
 # ---------------------------------------------------------------------------
@@ -371,8 +317,6 @@ async def test_streaming_sends_search_status_for_web_search() -> None:
 
 def test_format_source_urls_with_urls() -> None:
     """_format_source_urls should produce a formatted block with source links."""
-    from src.bot.handlers.message_handler import _format_source_urls
-
     result = _format_source_urls(["https://a.com", "https://b.com"])
     assert "Источники" in result
     assert "https://a.com" in result
@@ -381,8 +325,6 @@ def test_format_source_urls_with_urls() -> None:
 
 def test_format_source_urls_single_url() -> None:
     """_format_source_urls should work with a single URL."""
-    from src.bot.handlers.message_handler import _format_source_urls
-
     result = _format_source_urls(["https://only.com"])
     assert "https://only.com" in result
     assert "Источники" in result
@@ -390,32 +332,20 @@ def test_format_source_urls_single_url() -> None:
 
 def test_format_source_urls_empty() -> None:
     """_format_source_urls should return empty string for no URLs."""
-    from src.bot.handlers.message_handler import _format_source_urls
-
     assert _format_source_urls([]) == ""
 
 
 def test_format_source_urls_deduplicates() -> None:
     """_format_source_urls should remove duplicate URLs."""
-    from src.bot.handlers.message_handler import _format_source_urls
-
     result = _format_source_urls(["https://a.com", "https://a.com", "https://b.com"])
     assert result.count("https://a.com") == 1
     assert "https://b.com" in result
 
 
-@pytest.mark.asyncio
-async def test_streaming_appends_source_urls() -> None:
+async def test_streaming_appends_source_urls(
+    settings: AppSettings, make_handler: HandlerFactory
+) -> None:
     """Streaming handler should append source URLs to the final message."""
-    from src.bot.filters.access_filter import AccessFilter
-
-    settings = AppSettings(
-        mistral_api_key="test-key",
-        telegram_bot_token="test-token",
-    )
-    settings.bot.enable_streaming = True
-    settings.access.allowed_user_ids = [1]
-
     mistral = MagicMock()
 
     async def mock_stream(prompt, user_id=None, image_urls=None):
@@ -428,19 +358,50 @@ async def test_streaming_appends_source_urls() -> None:
     mistral._web_search = MagicMock()
     mistral._should_use_web_search = MagicMock(return_value=True)
 
-    af = AccessFilter(settings)
-    handler = MessageHandler(settings, mistral, af)
+    handler = make_handler(settings, mistral)
 
-    message = MagicMock()
-    sent_status = AsyncMock()
-    sent_status.edit_text = AsyncMock()
-    message.reply_text = AsyncMock(return_value=sent_status)
+    message, sent_status = _fake_message()
 
     await handler._handle_streaming_response(message, "новости сегодня", 1, "[You]: новости")
 
     # Check that the final edit contains the source URLs
-    last_edit_call = sent_status.edit_text.call_args_list[-1]
-    final_text = last_edit_call[0][0]
+    last_args, _ = sent_status.edit_text.calls[-1]
+    final_text = last_args[0]
     assert "https://src1.com" in final_text
     assert "https://src2.com" in final_text
     assert "Источники" in final_text
+
+
+async def test_streaming_delivers_final_answer_with_open_circuit(
+    _base_settings: AppSettings, make_handler: HandlerFactory
+) -> None:
+    """An open circuit sheds intermediate edits but never the final answer."""
+    settings = _derive(
+        _base_settings,
+        enable_streaming=True,
+        streaming_threshold=1,
+        streaming_update_interval=0.0,
+    )
+    mistral = MagicMock()
+
+    async def mock_stream(prompt, user_id=None, image_urls=None):
+        # Telegram starts throttling the chat once the status message is out
+        breaker = _telegram_breakers.for_chat(1)
+        for _ in range(TELEGRAM_BREAKER_THRESHOLD):
+            breaker.record_failure()
+        yield ("Partial", "Partial", False, [])
+        yield (" answer", "Partial answer", True, [])
+
+    mistral.generate_stream = mock_stream
+    mistral._memory = MagicMock()
+    mistral._web_search = None
+    mistral._should_use_web_search = MagicMock(return_value=False)
+
+    handler = make_handler(settings, mistral)
+
+    message, sent_status = _fake_message()
+
+    await handler._handle_streaming_response(message, "test", 1, "[You]: test")
+
+    # The intermediate "Partial" edit was dropped; the final text still went out
+    assert [args[0] for args, _ in sent_status.edit_text.calls] == ["Partial answer"]
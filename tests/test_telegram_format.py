@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pytest
+
 from src.utils.telegram_format import (
     escape_telegram_markdown,
     markdown_to_telegram,
@@ -9,80 +11,65 @@ from src.utils.telegram_format import (
     telegram_to_markdown,
 )
 
+# Golden outputs for escape_telegram_markdown with formatting protection on
+ESCAPE_CASES = [
+    # Underscores in regular text are escaped
+    pytest.param(
+        "variable_name and another_variable",
+        "variable\\_name and another\\_variable",
+        id="escape_underscores_in_text",
+    ),
+    # Intentional italic formatting is preserved
+    pytest.param("This is _italic_ text", "This is _italic_ text", id="preserve_italic"),
+    # Square brackets are escaped when not part of links
+    pytest.param(
+        "Array[0] and dict[key]", "Array\\[0\\] and dict\\[key\\]", id="escape_square_brackets"
+    ),
+    pytest.param(
+        "Check [this link](http://example.com)",
+        "Check [this link](http://example.com)",
+        id="preserve_links",
+    ),
+    # Code blocks and inline code are not escaped
+    pytest.param(
+        "Code: ```python\ndef func_name():\n    pass\n```",
+        "Code: ```python\ndef func_name():\n    pass\n```",
+        id="preserve_code_blocks",
+    ),
+    pytest.param(
+        "Use `variable_name` in your code",
+        "Use `variable_name` in your code",
+        id="preserve_inline_code",
+    ),
+    # Only text outside code and links is escaped
+    pytest.param(
+        "Variable my_var in `code_block` and [link](url) plus other_var",
+        "Variable my\\_var in `code_block` and [link](url) plus other\\_var",
+        id="mixed_content",
+    ),
+    pytest.param("", "", id="empty_text"),
+    pytest.param(None, None, id="none"),
+    pytest.param(
+        "Simple text without special characters",
+        "Simple text without special characters",
+        id="no_special_chars",
+    ),
+]
+
 
 class TestEscapeTelegramMarkdown:
     """Tests for escape_telegram_markdown function."""
 
-    def test_escape_underscores_in_text(self) -> None:
-        """Test that underscores in regular text are escaped."""
-        text = "variable_name and another_variable"
-        result = escape_telegram_markdown(text)
-        assert result == "variable\\_name and another\\_variable"
-
-    def test_preserve_italic_formatting(self) -> None:
-        """Test that intentional italic formatting with underscores is preserved."""
-        text = "This is _italic_ text"
-        result = escape_telegram_markdown(text)
-        assert result == "This is _italic_ text"
-
-    def test_escape_square_brackets(self) -> None:
-        """Test that square brackets are escaped when not part of links."""
-        text = "Array[0] and dict[key]"
-        result = escape_telegram_markdown(text)
-        assert result == "Array\\[0\\] and dict\\[key\\]"
-
-    def test_preserve_links(self) -> None:
-        """Test that markdown links are preserved without escaping."""
-        text = "Check [this link](http://example.com)"
-        result = escape_telegram_markdown(text)
-        assert result == "Check [this link](http://example.com)"
-
-    def test_preserve_code_blocks(self) -> None:
-        """Test that code blocks are not escaped."""
-        text = "Code: ```python\ndef func_name():\n    pass\n```"
-        result = escape_telegram_markdown(text)
-        assert "func\\_name" not in result
-        assert "func_name" in result
-
-    def test_preserve_inline_code(self) -> None:
-        """Test that inline code is not escaped."""
-        text = "Use `variable_name` in your code"
-        result = escape_telegram_markdown(text)
-        assert "`variable_name`" in result
-        assert "`variable\\_name`" not in result
-
-    def test_mixed_content(self) -> None:
-        """Test escaping with mixed content types."""
-        text = "Variable my_var in `code_block` and [link](url) plus other_var"
-        result = escape_telegram_markdown(text)
-        # my_var should be escaped (not in code/link)
-        assert "my\\_var" in result
-        # code_block should NOT be escaped (inside backticks)
-        assert "`code_block`" in result
-        assert "`code\\_block`" not in result
-        # link should be preserved
-        assert "[link](url)" in result
-        # other_var should be escaped
-        assert "other\\_var" in result
-
-    def test_empty_text(self) -> None:
-        """Test that empty text is handled correctly."""
-        assert escape_telegram_markdown("") == ""
-        assert escape_telegram_markdown(None) is None
-
-    def test_no_special_chars(self) -> None:
-        """Test text without special characters."""
-        text = "Simple text without special characters"
-        result = escape_telegram_markdown(text)
-        assert result == text
+    @pytest.mark.parametrize(("text", "expected"), ESCAPE_CASES)
+    def test_escape(self, text: str | None, expected: str | None) -> None:
+        """escape_telegram_markdown produces the exact expected output."""
+        assert escape_telegram_markdown(text) == expected
 
     def test_protect_formatting_disabled(self) -> None:
         """Test that disabling protect_formatting escapes everything."""
         text = "Use `code` and _italic_ with under_scores"
         result = escape_telegram_markdown(text, protect_formatting=False)
-        # Everything should be escaped
-        assert "\\`" in result
-        assert "\\_" in result
+        assert result == "Use \\`code\\` and \\_italic\\_ with under\\_scores"
 
 
 class TestMarkdownToTelegram:
@@ -209,97 +196,93 @@ class TestNormalizeMarkdownForTelegram:
         assert result1 == result2
 
 
-class TestRealWorldExamples:
-    """Tests with real-world examples that could cause issues."""
-
-    def test_python_code_example(self) -> None:
-        """Test Python code with underscores."""
-        text = """Here's a Python function:
+# Real-world inputs for markdown_to_telegram: (text, present, absent).  Each
+# entry in ``present`` is a substring, or a tuple of alternatives of which at
+# least one must appear; every substring in ``absent`` must not appear.
+REAL_WORLD_CASES = [
+    pytest.param(
+        """Here's a Python function:
 ```python
 def calculate_sum(first_number, second_number):
     return first_number + second_number
 ```
-Use it like: result = calculate_sum(1, 2)"""
-        result = markdown_to_telegram(text)
-        # Code block should not be escaped
-        assert "first_number" in result
-        assert "second_number" in result
-        assert "first\\_number" not in result or "```" in result
-        # Outside code block should be escaped
-        assert "calculate\\_sum" in result or "`" in result
-
-    def test_file_paths(self) -> None:
-        """Test file paths with underscores and special chars."""
-        text = "File: /path/to/my_file.txt and config_file.yaml"
-        result = markdown_to_telegram(text)
-        assert "my\\_file" in result
-        assert "config\\_file" in result
-
-    def test_api_response_example(self) -> None:
-        """Test API response with JSON-like syntax."""
-        text = 'Response: {"user_id": 123, "user_name": "test"}'
-        result = markdown_to_telegram(text)
-        # Underscores should be escaped
-        assert "user\\_id" in result
-        assert "user\\_name" in result
-
-    def test_markdown_table_like(self) -> None:
-        """Test text that looks like a markdown table."""
-        text = "Column_1 | Column_2 | Column_3"
-        result = markdown_to_telegram(text)
-        # Underscores should be escaped
-        assert "Column\\_1" in result
-        assert "Column\\_2" in result
-        assert "Column\\_3" in result
-
-    def test_mixed_bold_and_underscores(self) -> None:
-        """Test bold text containing underscores."""
-        text = "**Important: my_variable** is used here"
-        result = markdown_to_telegram(text)
+Use it like: result = calculate_sum(1, 2)""",
+        # Code block should be kept and not escaped; outside it underscores are
+        ("first_number", "second_number", "```", ("calculate\\_sum", "`")),
+        (),
+        id="python_code",
+    ),
+    pytest.param(
+        "File: /path/to/my_file.txt and config_file.yaml",
+        ("my\\_file", "config\\_file"),
+        (),
+        id="file_paths",
+    ),
+    pytest.param(
+        'Response: {"user_id": 123, "user_name": "test"}',
+        ("user\\_id", "user\\_name"),
+        (),
+        id="api_response",
+    ),
+    pytest.param(
+        "Column_1 | Column_2 | Column_3",
+        ("Column\\_1", "Column\\_2", "Column\\_3"),
+        (),
+        id="markdown_table_like",
+    ),
+    pytest.param(
+        "**Important: my_variable** is used here",
         # Bold should be converted and underscores escaped
-        assert "*Important: my\\_variable*" in result or "my\\_variable" in result
-
-    def test_url_with_underscores(self) -> None:
-        """Test URLs with underscores in links."""
-        text = "[docs](https://example.com/api_docs/user_guide)"
-        result = markdown_to_telegram(text)
+        (("*Important: my\\_variable*", "my\\_variable"),),
+        (),
+        id="mixed_bold_and_underscores",
+    ),
+    pytest.param(
+        "[docs](https://example.com/api_docs/user_guide)",
         # Link should be preserved as-is
-        assert "[docs](https://example.com/api_docs/user_guide)" in result
-
-    def test_multiple_consecutive_underscores(self) -> None:
-        """Test text with multiple consecutive underscores."""
-        text = "Use __init__ method"
-        result = markdown_to_telegram(text)
-        # Should escape underscores
-        assert "\\_\\_init\\_\\_" in result or "__init__" in result
-
-    def test_underscore_at_word_boundary(self) -> None:
-        """Test underscores at word boundaries."""
-        text = "_start_of_word and end_of_word_"
-        result = markdown_to_telegram(text)
+        ("[docs](https://example.com/api_docs/user_guide)",),
+        (),
+        id="url_with_underscores",
+    ),
+    pytest.param(
+        "Use __init__ method",
+        (("\\_\\_init\\_\\_", "__init__"),),
+        (),
+        id="multiple_consecutive_underscores",
+    ),
+    pytest.param(
+        "_start_of_word and end_of_word_",
         # First underscore might be italic, others should be escaped
-        assert "\\_" in result or "_" in result
+        (("\\_", "_"),),
+        (),
+        id="underscore_at_word_boundary",
+    ),
+    pytest.param("Cost: 5*3 = 15", ("5\\*3",), (), id="unpaired_asterisk"),
+    pytest.param("The ` character is used for code", ("\\`",), (), id="unpaired_backtick"),
+    pytest.param(
+        "## Header with **bold** text",
+        # Headers with bold text must not produce nested or double asterisks
+        ("*Header with bold text*",),
+        ("**", "*Header with *bold* text*"),
+        id="header_with_bold_text",
+    ),
+]
 
-    def test_unpaired_asterisk_escaping(self) -> None:
-        """Test that unpaired asterisks are escaped."""
-        text = "Cost: 5*3 = 15"
-        result = markdown_to_telegram(text)
-        # Unpaired asterisk should be escaped
-        assert "5\\*3" in result
 
-    def test_unpaired_backtick_escaping(self) -> None:
-        """Test that unpaired backticks are escaped."""
-        text = "The ` character is used for code"
-        result = markdown_to_telegram(text)
-        # Unpaired backticks should be escaped
-        assert "\\`" in result
+class TestRealWorldExamples:
+    """Tests with real-world examples that could cause issues."""
 
-    def test_header_with_bold_text(self) -> None:
-        """Test that headers with bold text don't create nested asterisks."""
-        text = "## Header with **bold** text"
+    @pytest.mark.parametrize(("text", "present", "absent"), REAL_WORLD_CASES)
+    def test_markdown_to_telegram(
+        self,
+        text: str,
+        present: tuple[str | tuple[str, ...], ...],
+        absent: tuple[str, ...],
+    ) -> None:
+        """markdown_to_telegram escapes and converts real-world text safely."""
         result = markdown_to_telegram(text)
-        # Should not have nested asterisks
-        assert "*Header with bold text*" in result
-        # Should not have double or nested asterisks
-        assert "**" not in result
-        assert "*Header with *bold* text*" not in result
+        for expected in present:
+            alternatives = (expected,) if isinstance(expected, str) else expected
+            assert any(alt in result for alt in alternatives), (alternatives, result)
+        for unexpected in absent:
+            assert unexpected not in result, (unexpected, result)
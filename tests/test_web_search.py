@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from collections.abc import Awaitable, Callable
+from contextlib import ExitStack
+from typing import Any
+from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
@@ -18,58 +21,106 @@ from src.api.web_search import (
     WebSearchClient,
 )
 
-# ---------------------------------------------------------------------------
-# Initialisation tests
-# ---------------------------------------------------------------------------
+# Shared responses for the retry tests; raise_for_status() does not mutate them
+_REQ = httpx.Request("GET", "https://x")
+_RESP_200 = httpx.Response(200, request=_REQ)
+_RESP_429 = httpx.Response(429, request=_REQ)
+_RESP_403 = httpx.Response(403, request=_REQ)
+# Raise via _FORBIDDEN.with_traceback(None) so tracebacks do not pile up across raises
+_FORBIDDEN = httpx.HTTPStatusError("Forbidden", request=_REQ, response=_RESP_403)
+
+# Provider results returned by the stubs below; tests compare against them, never mutate them
+_OK_SEARXNG = SearchResult(
+    text="1. Result\nContent\nИсточник: https://example.com",
+    urls=["https://example.com"],
+)
+_OK_PERPLEXITY = SearchResult(
+    text="1. Perplexity Result\nContent\nИсточник: https://perplexity.example.com",
+    urls=["https://perplexity.example.com"],
+)
+_OK_DDG = SearchResult(
+    text="1. DDG Result\nContent\nИсточник: https://ddg.example.com",
+    urls=["https://ddg.example.com"],
+)
 
 
-def test_default_providers_without_google() -> None:
-    """Client without Google keys should have SearXNG + Perplexity + DuckDuckGo providers."""
-    client = WebSearchClient()
-    assert client.providers == [
-        SearchProvider.SEARXNG,
-        SearchProvider.PERPLEXITY,
-        SearchProvider.DUCKDUCKGO,
-    ]
+def _respond_with(payload: dict[str, Any]) -> Callable[..., Awaitable[httpx.Response]]:
+    """Build a _retry_with_backoff stand-in that answers with *payload* as a 200 JSON body."""
+    response = httpx.Response(200, json=payload, request=_REQ)
 
+    async def retry_with_backoff(coro_factory: object, provider_name: str) -> httpx.Response:
+        return response
 
-def test_default_providers_with_google() -> None:
-    """Client with Google keys should have all four providers."""
-    client = WebSearchClient(google_api_key="key", google_search_engine_id="cx")
-    assert client.providers == [
-        SearchProvider.GOOGLE,
-        SearchProvider.SEARXNG,
-        SearchProvider.PERPLEXITY,
-        SearchProvider.DUCKDUCKGO,
-    ]
+    return retry_with_backoff
 
 
-def test_default_searxng_instances() -> None:
-    """Default SearXNG instances list should be populated."""
-    client = WebSearchClient()
-    assert len(client.searxng_instances) == len(DEFAULT_SEARXNG_INSTANCES)
-    assert client.searxng_instances[0] == DEFAULT_SEARXNG_INSTANCES[0]
+@pytest.fixture(scope="module")
+def client() -> WebSearchClient:
+    """Share one default client; tests only patch it through context managers."""
+    return WebSearchClient()
 
 
-def test_custom_searxng_instances() -> None:
-    """Custom instances list should override defaults; primary is prepended."""
-    custom = ["https://custom1.example.com", "https://custom2.example.com"]
-    client = WebSearchClient(searxng_instances=custom)
-    # The default primary instance ("https://searx.be") is prepended automatically.
-    assert client.searxng_instances[0] == "https://searx.be"
-    assert "https://custom1.example.com" in client.searxng_instances
-    assert "https://custom2.example.com" in client.searxng_instances
+@pytest.fixture(autouse=True)
+def mock_sleep(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Replace the backoff sleep so no test waits for real, even on an unexpected retry."""
+    sleep = AsyncMock()
+    monkeypatch.setattr("src.api.web_search.asyncio.sleep", sleep)
+    return sleep
 
 
-def test_primary_instance_prepended() -> None:
-    """Primary instance should be inserted at the front if not already present."""
-    custom = ["https://custom1.example.com"]
-    client = WebSearchClient(
-        searxng_instance="https://primary.example.com",
-        searxng_instances=custom,
-    )
-    assert client.searxng_instances[0] == "https://primary.example.com"
-    assert "https://custom1.example.com" in client.searxng_instances
+# ---------------------------------------------------------------------------
+# Initialisation tests
+# ---------------------------------------------------------------------------
+
+
+_DEFAULT_PROVIDERS = [
+    SearchProvider.SEARXNG,
+    SearchProvider.PERPLEXITY,
+    SearchProvider.DUCKDUCKGO,
+]
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected_providers", "expected_instances"),
+    [
+        pytest.param({}, _DEFAULT_PROVIDERS, DEFAULT_SEARXNG_INSTANCES, id="defaults"),
+        # Google is only tried first when both the key and the engine id are given
+        pytest.param(
+            {"google_api_key": "key", "google_search_engine_id": "cx"},
+            [SearchProvider.GOOGLE, *_DEFAULT_PROVIDERS],
+            DEFAULT_SEARXNG_INSTANCES,
+            id="with_google",
+        ),
+        # Custom instances replace the defaults; the default primary is prepended
+        pytest.param(
+            {"searxng_instances": ["https://custom1.example.com", "https://custom2.example.com"]},
+            _DEFAULT_PROVIDERS,
+            ["https://searx.be", "https://custom1.example.com", "https://custom2.example.com"],
+            id="custom_instances",
+        ),
+        pytest.param(
+            {
+                "searxng_instance": "https://primary.example.com",
+                "searxng_instances": ["https://custom1.example.com"],
+            },
+            _DEFAULT_PROVIDERS,
+            ["https://primary.example.com", "https://custom1.example.com"],
+            id="primary_prepended",
+        ),
+    ],
+)
+def test_client_init(
+    client: WebSearchClient,
+    kwargs: dict[str, Any],
+    expected_providers: list[SearchProvider],
+    expected_instances: list[str],
+) -> None:
+    """Providers and SearXNG instance order follow the constructor arguments."""
+    if kwargs:
+        client = WebSearchClient(**kwargs)
+
+    assert client.providers == expected_providers
+    assert client.searxng_instances == expected_instances
 
 
 # ---------------------------------------------------------------------------
@@ -77,62 +128,44 @@ def test_primary_instance_prepended() -> None:
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_retry_backoff_succeeds_on_second_attempt() -> None:
+async def test_retry_backoff_succeeds_on_second_attempt(mock_sleep: AsyncMock) -> None:
     """_retry_with_backoff should retry on a 429 and succeed on the second call."""
-    ok_response = httpx.Response(200, request=httpx.Request("GET", "https://x"))
-
-    fail_response = httpx.Response(429, request=httpx.Request("GET", "https://x"))
-
-    call_count = 0
+    calls: list[None] = []
 
     async def factory():  # noqa: ANN202
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            resp = fail_response
-            resp.raise_for_status()  # raises HTTPStatusError
-        return ok_response
+        calls.append(None)
+        if len(calls) == 1:
+            _RESP_429.raise_for_status()  # raises HTTPStatusError
+        return _RESP_200
 
-    with patch("src.api.web_search.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
-        result = await WebSearchClient._retry_with_backoff(factory, "test-provider")
+    result = await WebSearchClient._retry_with_backoff(factory, "test-provider")
 
     assert result.status_code == 200
-    assert call_count == 2
+    assert len(calls) == 2
     mock_sleep.assert_called_once_with(_BACKOFF_BASE)
 
 
-@pytest.mark.asyncio
 async def test_retry_backoff_raises_after_max_retries() -> None:
     """_retry_with_backoff should raise after exhausting retries."""
-    fail_response = httpx.Response(429, request=httpx.Request("GET", "https://x"))
-
     async def factory():  # noqa: ANN202
-        fail_response.raise_for_status()
+        _RESP_429.raise_for_status()
 
-    with (
-        patch("src.api.web_search.asyncio.sleep", new_callable=AsyncMock),
-        pytest.raises(httpx.HTTPStatusError),
-    ):
+    with pytest.raises(httpx.HTTPStatusError):
         await WebSearchClient._retry_with_backoff(factory, "test-provider")
 
 
-@pytest.mark.asyncio
 async def test_retry_backoff_no_retry_on_non_retryable() -> None:
     """_retry_with_backoff should NOT retry on non-retryable status codes like 403."""
-    fail_response = httpx.Response(403, request=httpx.Request("GET", "https://x"))
-
-    call_count = 0
+    calls: list[None] = []
 
     async def factory():  # noqa: ANN202
-        nonlocal call_count
-        call_count += 1
-        fail_response.raise_for_status()
+        calls.append(None)
+        _RESP_403.raise_for_status()
 
     with pytest.raises(httpx.HTTPStatusError):
         await WebSearchClient._retry_with_backoff(factory, "test-provider")
 
-    assert call_count == 1  # No retry
+    assert len(calls) == 1  # No retry
 
 
 # ---------------------------------------------------------------------------
@@ -140,7 +173,6 @@ async def test_retry_backoff_no_retry_on_non_retryable() -> None:
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_searxng_falls_back_on_403() -> None:
     """SearXNG should try the next instance when the first returns 403."""
     client = WebSearchClient(
@@ -149,20 +181,15 @@ async def test_searxng_falls_back_on_403() -> None:
 
     async def mock_instance(instance_url: str, query: str, count: int) -> SearchResult:
         if instance_url == "https://blocked.example.com":
-            resp = httpx.Response(403, request=httpx.Request("GET", instance_url))
-            raise httpx.HTTPStatusError("Forbidden", request=resp.request, response=resp)
-        return SearchResult(
-            text="1. Result\nContent\nИсточник: https://example.com",
-            urls=["https://example.com"],
-        )
-
-    with patch.object(client, "_search_searxng_instance", side_effect=mock_instance):
+            raise _FORBIDDEN.with_traceback(None)
+        return _OK_SEARXNG
+
+    with patch.object(client, "_search_searxng_instance", new=mock_instance):
         result = await client._search_searxng("test query", 3)
 
-    assert "Result" in result.text
+    assert result is _OK_SEARXNG
 
 
-@pytest.mark.asyncio
 async def test_searxng_all_instances_fail() -> None:
     """SearXNG should raise when all instances return 403."""
     client = WebSearchClient(
@@ -170,11 +197,10 @@ async def test_searxng_all_instances_fail() -> None:
     )
 
     async def mock_instance(instance_url: str, query: str, count: int) -> SearchResult:
-        resp = httpx.Response(403, request=httpx.Request("GET", instance_url))
-        raise httpx.HTTPStatusError("Forbidden", request=resp.request, response=resp)
+        raise _FORBIDDEN.with_traceback(None)
 
     with (
-        patch.object(client, "_search_searxng_instance", side_effect=mock_instance),
+        patch.object(client, "_search_searxng_instance", new=mock_instance),
         pytest.raises(httpx.HTTPStatusError),
     ):
         await client._search_searxng("test query", 3)
@@ -185,50 +211,46 @@ async def test_searxng_all_instances_fail() -> None:
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_duckduckgo_retries_on_ratelimit() -> None:
+class _FakeDDGS:
+    """Stand-in for the DDGS context manager that delegates text() to a test function."""
+
+    def __init__(self, text_fn: Callable[[str, int], list[dict[str, str]]]) -> None:
+        self._text = text_fn
+
+    def __enter__(self) -> _FakeDDGS:
+        return self
+
+    def __exit__(self, *exc_info: object) -> bool:
+        return False
+
+    def text(self, query: str, max_results: int = 3) -> list[dict[str, str]]:
+        return self._text(query, max_results)
+
+
+async def test_duckduckgo_retries_on_ratelimit(client: WebSearchClient) -> None:
     """DuckDuckGo should retry on ratelimit errors."""
-    client = WebSearchClient()
-    call_count = 0
+    calls: list[None] = []
 
     def mock_text(query: str, max_results: int = 3):  # noqa: ANN202, ARG001
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
+        calls.append(None)
+        if len(calls) == 1:
             raise Exception("Ratelimit 202")
         return [{"title": "T", "body": "B", "href": "https://example.com"}]
 
-    mock_ddgs = MagicMock()
-    mock_ddgs.__enter__ = MagicMock(return_value=mock_ddgs)
-    mock_ddgs.__exit__ = MagicMock(return_value=False)
-    mock_ddgs.text = mock_text
-
-    with (
-        patch("src.api.web_search.DDGS", return_value=mock_ddgs),
-        patch("src.api.web_search.asyncio.sleep", new_callable=AsyncMock),
-    ):
+    with patch("src.api.web_search.DDGS", return_value=_FakeDDGS(mock_text)):
         result = await client._search_duckduckgo("test", 3)
 
     assert "T" in result.text
-    assert call_count == 2
+    assert len(calls) == 2
 
 
-@pytest.mark.asyncio
-async def test_duckduckgo_raises_after_max_ratelimit_retries() -> None:
+async def test_duckduckgo_raises_after_max_ratelimit_retries(client: WebSearchClient) -> None:
     """DuckDuckGo should raise after exhausting ratelimit retries."""
-    client = WebSearchClient()
-
     def mock_text(query: str, max_results: int = 3):  # noqa: ANN202, ARG001
         raise Exception("Ratelimit 202")
 
-    mock_ddgs = MagicMock()
-    mock_ddgs.__enter__ = MagicMock(return_value=mock_ddgs)
-    mock_ddgs.__exit__ = MagicMock(return_value=False)
-    mock_ddgs.text = mock_text
-
     with (
-        patch("src.api.web_search.DDGS", return_value=mock_ddgs),
-        patch("src.api.web_search.asyncio.sleep", new_callable=AsyncMock),
+        patch("src.api.web_search.DDGS", return_value=_FakeDDGS(mock_text)),
         pytest.raises(Exception, match="Ratelimit"),
     ):
         await client._search_duckduckgo("test", 3)
@@ -239,21 +261,15 @@ async def test_duckduckgo_raises_after_max_ratelimit_retries() -> None:
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_search_perplexity_returns_results() -> None:
+async def test_search_perplexity_returns_results(client: WebSearchClient) -> None:
     """_search_perplexity should parse results from the API response."""
-    client = WebSearchClient()
-
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
+    payload = {
         "results": [
             {"title": "Perplexity Title", "content": "Some content", "url": "https://perplexity.example.com"},
         ]
     }
 
-    with patch.object(
-        client, "_retry_with_backoff", new_callable=AsyncMock, return_value=mock_response
-    ):
+    with patch.object(client, "_retry_with_backoff", new=_respond_with(payload)):
         result = await client._search_perplexity("test query", 3)
 
     assert "Perplexity Title" in result.text
@@ -261,106 +277,72 @@ async def test_search_perplexity_returns_results() -> None:
     assert "https://perplexity.example.com" in result.urls
 
 
-@pytest.mark.asyncio
-async def test_search_perplexity_uses_snippet_fallback() -> None:
+async def test_search_perplexity_uses_snippet_fallback(client: WebSearchClient) -> None:
     """_search_perplexity should fall back to 'snippet' when 'content' is absent."""
-    client = WebSearchClient()
-
-    mock_response = MagicMock()
-    mock_response.json.return_value = {
+    payload = {
         "results": [
             {"title": "Title", "snippet": "Snippet text", "url": "https://example.com"},
         ]
     }
 
-    with patch.object(
-        client, "_retry_with_backoff", new_callable=AsyncMock, return_value=mock_response
-    ):
+    with patch.object(client, "_retry_with_backoff", new=_respond_with(payload)):
         result = await client._search_perplexity("test query", 3)
 
     assert "Snippet text" in result.text
 
 
-@pytest.mark.asyncio
-async def test_search_perplexity_empty_results() -> None:
+async def test_search_perplexity_empty_results(client: WebSearchClient) -> None:
     """_search_perplexity should return empty SearchResult when no results."""
-    client = WebSearchClient()
+    payload = {"results": []}
 
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"results": []}
-
-    with patch.object(
-        client, "_retry_with_backoff", new_callable=AsyncMock, return_value=mock_response
-    ):
+    with patch.object(client, "_retry_with_backoff", new=_respond_with(payload)):
         result = await client._search_perplexity("test query", 3)
 
     assert not result
 
 
-@pytest.mark.asyncio
-async def test_search_falls_back_to_perplexity() -> None:
-    """search() should fall back to Perplexity when SearXNG fails."""
-    client = WebSearchClient()
-
-    async def fail_searxng(query: str, count: int) -> str:
-        raise Exception("SearXNG down")
-
-    async def ok_perplexity(query: str, count: int) -> str:
-        return "1. Perplexity Result\nContent\nИсточник: https://perplexity.example.com"
-
-    async def fail_ddg(query: str, count: int) -> str:
-        raise Exception("DDG down")
-
-    with (
-        patch.object(client, "_search_searxng", side_effect=fail_searxng),
-        patch.object(client, "_search_perplexity", side_effect=ok_perplexity),
-        patch.object(client, "_search_duckduckgo", side_effect=fail_ddg),
-    ):
-        result = await client.search("test query")
-
-    assert "Perplexity Result" in result
-
-
 # ---------------------------------------------------------------------------
 # Full search() fallback tests
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_search_falls_back_to_duckduckgo() -> None:
-    """search() should fall back to DuckDuckGo when SearXNG fails."""
-    client = WebSearchClient()
+@pytest.mark.parametrize(
+    ("success_provider", "expected"),
+    [
+        pytest.param("_search_perplexity", _OK_PERPLEXITY, id="perplexity"),
+        pytest.param("_search_duckduckgo", _OK_DDG, id="duckduckgo"),
+    ],
+)
+async def test_search_falls_back_past_failing_providers(
+    client: WebSearchClient, success_provider: str, expected: SearchResult
+) -> None:
+    """search() should return the first successful provider's result, URLs included."""
 
-    async def fail_searxng(query: str, count: int) -> SearchResult:
-        raise Exception("SearXNG down")
+    async def fail(query: str, count: int) -> SearchResult:
+        raise Exception("Provider down")
 
-    async def ok_ddg(query: str, count: int) -> SearchResult:
-        return SearchResult(
-            text="1. DDG Result\nContent\nИсточник: https://ddg.example.com",
-            urls=["https://ddg.example.com"],
-        )
+    async def ok(query: str, count: int) -> SearchResult:
+        return expected
 
-    with (
-        patch.object(client, "_search_searxng", side_effect=fail_searxng),
-        patch.object(client, "_search_duckduckgo", side_effect=ok_ddg),
-    ):
+    providers = ("_search_searxng", "_search_perplexity", "_search_duckduckgo")
+    with ExitStack() as stack:
+        for name in providers:
+            stub = ok if name == success_provider else fail
+            stack.enter_context(patch.object(client, name, new=stub))
         result = await client.search("test query")
 
-    assert "DDG Result" in result.text
+    assert result is expected
 
 
-@pytest.mark.asyncio
-async def test_search_returns_empty_when_all_fail() -> None:
+async def test_search_returns_empty_when_all_fail(client: WebSearchClient) -> None:
     """search() should return empty string when all providers fail."""
-    client = WebSearchClient()
-
     async def fail(query: str, count: int) -> SearchResult:
         raise Exception("Provider down")
 
     with (
-        patch.object(client, "_search_searxng", side_effect=fail),
-        patch.object(client, "_search_perplexity", side_effect=fail),
-        patch.object(client, "_search_duckduckgo", side_effect=fail),
+        patch.object(client, "_search_searxng", new=fail),
+        patch.object(client, "_search_perplexity", new=fail),
+        patch.object(client, "_search_duckduckgo", new=fail),
     ):
         result = await client.search("test query")
 
@@ -423,25 +405,3 @@ def test_search_result_urls_populated() -> None:
     )
     assert result.urls == ["https://a.com", "https://b.com"]
 
-
-@pytest.mark.asyncio
-async def test_search_returns_urls_on_fallback() -> None:
-    """search() should carry URLs through provider fallback."""
-    client = WebSearchClient()
-
-    async def fail_searxng(query: str, count: int) -> SearchResult:
-        raise Exception("SearXNG down")
-
-    async def ok_ddg(query: str, count: int) -> SearchResult:
-        return SearchResult(
-            text="1. Result\nBody\nИсточник: https://ddg.example.com",
-            urls=["https://ddg.example.com"],
-        )
-
-    with (
-        patch.object(client, "_search_searxng", side_effect=fail_searxng),
-        patch.object(client, "_search_duckduckgo", side_effect=ok_ddg),
-    ):
-        result = await client.search("test query")
-
-    assert result.urls == ["https://ddg.example.com"]